@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.cache import cache
+from threading import Lock
+import time
+
+
+class Version:
+    """A counter in the shared cache, bumped to drop every entry cached under the previous value."""
+
+    def __init__(self, key):
+        self.key = key
+
+    def get(self):
+        version = cache.get(self.key)
+        if version is None:
+            cache.add(self.key, 1, None)
+            version = cache.get(self.key, 1)
+        return version
+
+    def invalidate(self):
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, 1, None)
+
+
+class ProcessCache:
+    """
+    Keeps the result of `load` in the current process for the number of seconds in the `timeout_setting` setting.
+
+    Reads within the timeout touch neither the cache backend nor the database. invalidate() only reaches the current
+    process, other workers load the new value once their copy expires.
+    """
+
+    def __init__(self, load, timeout_setting):
+        self.load = load
+        self.timeout_setting = timeout_setting
+        self.lock = Lock()
+        self.value = None
+        self.expires = 0
+        self.generation = 0
+
+    def get(self):
+        if time.monotonic() >= self.expires:
+            with self.lock:
+                if time.monotonic() >= self.expires:
+                    generation = self.generation
+                    self.value = self.load()
+                    if generation == self.generation:
+                        self.expires = time.monotonic() + getattr(settings, self.timeout_setting)
+        return self.value
+
+    def invalidate(self):
+        self.generation += 1
+        self.expires = 0
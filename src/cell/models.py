@@ -4,9 +4,10 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from datetime import timedelta, datetime
 from user.models import User
 from resume.models import Skill
-from django.db.models import OuterRef, Subquery, Func
-from django.db.models import Q
+from django.db.models import OuterRef, Subquery, Func, F
 from django.utils.functional import cached_property
+from permissions import Permitted
+from caching import Version
 
 
 # Create your models here.
@@ -39,7 +40,7 @@ class Notice(models.Model):
 
     @cached_property
     def edit_users(self):
-        return User.objects.filter(is_superuser=True)
+        return Permitted('edit', self)
 
     def __str__(self):
         return self.title
@@ -62,11 +63,11 @@ class Message(models.Model):
 
     @cached_property
     def view_users(self):
-        return User.objects.filter(is_superuser=True, is_coordinator=True)
+        return Permitted('view', self)
     
     @cached_property
     def handle_users(self):
-        return User.objects.filter(is_superuser=True, is_coordinator=True)
+        return Permitted('handle', self)
 
     def __str__(self):
         return self.sender
@@ -95,15 +96,11 @@ class Quote(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user:
-            return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
-        return User.objects.filter(is_superuser=True)
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self.user:
-            return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
-        return User.objects.filter(is_superuser=True)
+        return Permitted('delete', self)
     
     def __str__(self):
         return self.quote + ' - ' + self.author
@@ -192,55 +189,35 @@ class RecruitmentPost(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user == None:
-            User.objects.filter(Q(is_superuser=True) | Q(is_coordinator=True)).distinct()
-        if self.user.is_superuser:
-            return User.objects.filter(is_superuser=True)
-        if self.user.is_coordinator:
-            return User.objects.filter(Q(is_superuser=True) | Q(is_coordinator=True)).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(is_coordinator=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def add_skill_users(self):
-        if self.user == None:
-            User.objects.filter(Q(is_superuser=True) | Q(is_coordinator=True)).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(is_coordinator=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('add_skill', self)
 
     @cached_property
     def remove_skill_users(self):
-        if self.user == None:
-            User.objects.filter(Q(is_superuser=True) | Q(is_coordinator=True)).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(is_coordinator=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('remove_skill', self)
 
     @cached_property
     def view_application_users(self):
-        if self.user == None:
-            User.objects.filter(is_superuser=True).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('view_application', self)
 
     @cached_property
     def select_application_users(self):
-        if self.user == None:
-            User.objects.filter(is_superuser=True).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('select_application', self)
 
     @cached_property
     def reject_application_users(self):
-        if self.user == None:
-            User.objects.filter(is_superuser=True).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('reject_application', self)
 
     @cached_property
     def shortlist_application_users(self):
-        if self.user == None:
-            User.objects.filter(is_superuser=True).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('shortlist_application', self)
 
     @cached_property
     def pending_application_users(self):
-        if self.user == None:
-            User.objects.filter(is_superuser=True).distinct()
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('pending_application', self)
 
     @cached_property
     def is_active(self):
@@ -268,13 +245,8 @@ class RecruitmentPostUpdate(Notice):
 
 
 class RecruitmentApplication(models.Model):
-    class DefaultManager(models.Manager):
-        def get_create_permission(self, post, user):
-            if (user.role == 'student' and user.is_approved) and post.is_active and not post.applications.filter(user=user).exists():
-                return True
-            return False
-
-        def get_queryset(self):
+    class QuerySet(models.QuerySet):
+        def with_computed_skill_counts(self):
             skill_matches = Skill.objects.filter(
                 users__id__exact=OuterRef('user_id'),
                 jobs__id__exact=OuterRef('recruitment_post_id')
@@ -290,12 +262,35 @@ class RecruitmentApplication(models.Model):
                 count=Func('id', function='Count')
             ).values('count')
 
-            queryset = super().get_queryset().annotate(
-                skill_matches=Subquery(skill_matches),
-                other_skills_count=Subquery(skill_extras)
+            return self.annotate(
+                computed_skill_matches=Subquery(skill_matches),
+                computed_other_skills_count=Subquery(skill_extras)
+            )
+
+        def update_skill_counts(self):
+            computed = RecruitmentApplication.objects.with_computed_skill_counts().filter(pk=OuterRef('pk'))
+            return self.update(
+                skill_matches=Subquery(computed.values('computed_skill_matches')),
+                other_skills_count=Subquery(computed.values('computed_other_skills_count'))
+            )
+
+        def stale_skill_counts(self):
+            return self.with_computed_skill_counts().exclude(
+                skill_matches=F('computed_skill_matches'),
+                other_skills_count=F('computed_other_skills_count')
             )
 
-            return queryset
+        def transitionable(self, status):
+            return self.filter(status__in=RecruitmentApplication.status_transitions[status])
+
+    class DefaultManager(models.Manager.from_queryset(QuerySet)):
+        def get_data_version(self, post_id):
+            return Version(f'recruitment-applications-data-version:{post_id}')
+
+        def get_create_permission(self, post, user):
+            if (user.role == 'student' and user.is_approved) and post.is_active and not post.applications.filter(user=user).exists():
+                return True
+            return False
 
     objects = DefaultManager()
 
@@ -306,6 +301,10 @@ class RecruitmentApplication(models.Model):
                 name='unique_application'
             ),
         ]
+        indexes = [
+            models.Index(fields=['recruitment_post', 'skill_matches']),
+            models.Index(fields=['recruitment_post', 'other_skills_count']),
+        ]
 
         base_manager_name = 'objects'
 
@@ -315,6 +314,12 @@ class RecruitmentApplication(models.Model):
         ('S', 'Selected'),
         ('I', 'Shortlisted for Interview'),
     ]
+    status_transitions = {
+        'S': ['P'],
+        'R': ['P'],
+        'I': ['P'],
+        'P': ['R', 'S', 'I'],
+    }
     user = models.ForeignKey(
         User, null=True, on_delete=models.CASCADE, related_name='job_applications')
     recruitment_post = models.ForeignKey(
@@ -325,27 +330,28 @@ class RecruitmentApplication(models.Model):
     applied_on = models.DateTimeField(auto_now_add=True, editable=False)
     status = models.CharField(
         max_length=1, choices=status_choices, default='P')
+    skill_matches = models.PositiveIntegerField(default=0, editable=False)
+    other_skills_count = models.PositiveIntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            skills = Skill.objects.filter(users__id__exact=self.user_id)
+            self.skill_matches = skills.filter(jobs__id__exact=self.recruitment_post_id).count()
+            self.other_skills_count = skills.exclude(jobs__id__exact=self.recruitment_post_id).count()
+        super().save(*args, **kwargs)
 
     @cached_property
     def select_users(self):
-        if self.status == 'P':
-            return self.recruitment_post.select_application_users
-        return User.objects.none()
+        return Permitted('select', self)
 
     @cached_property
     def reject_users(self):
-        if self.status == 'P':
-            return self.recruitment_post.reject_application_users
-        return User.objects.none()
+        return Permitted('reject', self)
 
     @cached_property
     def shortlist_users(self):
-        if self.status == 'P':
-            return self.recruitment_post.shortlist_application_users
-        return User.objects.none()
+        return Permitted('shortlist', self)
 
     @cached_property
     def pending_users(self):
-        if self.status != 'P':
-            return self.recruitment_post.pending_application_users
-        return User.objects.none()
+        return Permitted('pending', self)
@@ -0,0 +1,126 @@
+from dataclasses import dataclass, astuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from resume.models import Skill
+from student.models import StudentProfile
+from .models import RecruitmentApplication
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    skills: float = 1.0
+    cgpa: float = 1.0
+    backlogs: float = 0.5
+    year: float = 0.0
+    course: float = 0.0
+    required_skills: tuple = ()
+    optional_skills: tuple = ()
+    preferred_courses: tuple = ()
+
+    @classmethod
+    def from_query(cls, query, post_skills):
+        def weight(name):
+            try:
+                value = float(query.get(f'rank-{name}', getattr(cls, name)))
+            except ValueError:
+                return getattr(cls, name)
+            if not math.isfinite(value):
+                return getattr(cls, name)
+            return min(max(value, 0.0), 10.0)
+
+        required_skills = tuple(sorted(int(skill) for skill in query.getlist('required-skills')
+                                       if skill.isdigit() and int(skill) in post_skills))
+        courses = [course[0] for course in StudentProfile.course_choices]
+        return cls(
+            skills=weight('skills'),
+            cgpa=weight('cgpa'),
+            backlogs=weight('backlogs'),
+            year=weight('year'),
+            course=weight('course'),
+            required_skills=required_skills,
+            optional_skills=tuple(sorted(set(post_skills) - set(required_skills))),
+            preferred_courses=tuple(sorted(set(query.getlist('preferred-courses')) & set(courses))),
+        )
+
+    @property
+    def key(self):
+        return ':'.join(','.join(map(str, value)) if isinstance(value, tuple) else f'{value:g}'
+                        for value in astuple(self))
+
+
+@dataclass
+class Ranking:
+    application_ids: list
+    scores: dict
+
+
+def load_pool(post_id, weights):
+    applications = list(RecruitmentApplication.objects.filter(recruitment_post_id=post_id).values_list('pk', 'user_id'))
+    application_ids = np.array([application[0] for application in applications], dtype=np.int64)
+    user_ids = [application[1] for application in applications]
+    user_index = {user_id: index for index, user_id in enumerate(user_ids)}
+
+    skills = list(weights.required_skills + weights.optional_skills)
+    skill_index = {skill_id: index for index, skill_id in enumerate(skills)}
+    matrix = np.zeros((len(applications), len(skills)), dtype=bool)
+    if skills:
+        for user_id, skill_id in Skill.users.through.objects.filter(
+                user_id__in=user_ids, skill_id__in=skills).values_list('user_id', 'skill_id'):
+            matrix[user_index[user_id], skill_index[skill_id]] = True
+
+    cgpa = np.zeros(len(applications))
+    backlogs = np.zeros(len(applications))
+    year = np.zeros(len(applications))
+    course = np.empty(len(applications), dtype=object)
+    for user_id, profile_cgpa, profile_backlogs, profile_year, profile_course in StudentProfile.objects.filter(
+            user_id__in=user_ids).values_list('user_id', 'cgpa', 'backlog_count', 'year', 'course'):
+        index = user_index[user_id]
+        cgpa[index] = profile_cgpa
+        backlogs[index] = profile_backlogs
+        year[index] = profile_year
+        course[index] = profile_course
+
+    return application_ids, matrix, cgpa, backlogs, year, course
+
+
+def rank(post_id, weights):
+    application_ids, matrix, cgpa, backlogs, year, course = load_pool(post_id, weights)
+    required = len(weights.required_skills)
+
+    eligible = matrix[:, :required].all(axis=1)
+    optional = matrix[:, required:]
+    skill_score = optional.mean(axis=1) if optional.shape[1] else np.zeros(len(application_ids))
+    backlog_score = 1 - backlogs / max(backlogs.max(initial=0), 1)
+    year_score = year / max(year.max(initial=0), 1)
+    course_score = np.isin(course.astype(str), list(weights.preferred_courses)).astype(float)
+
+    score = (weights.skills * skill_score + weights.cgpa * cgpa / 10 + weights.backlogs * backlog_score +
+             weights.year * year_score + weights.course * course_score)
+
+    application_ids, score = application_ids[eligible], score[eligible]
+    order = np.lexsort((application_ids, -score))
+    return Ranking(
+        application_ids=application_ids[order].tolist(),
+        scores=dict(zip(application_ids[order].tolist(), np.round(score[order], 3).tolist())),
+    )
+
+
+def get_ranking(post_id, weights):
+    # The pool only changes when an application is added or removed, so its size and latest one identify it
+    pool = RecruitmentApplication.objects.filter(recruitment_post_id=post_id).aggregate(
+        count=Count('pk'), latest=Max('applied_on'))
+    latest = pool['latest'].timestamp() if pool['latest'] else 0
+    key = (f'applicant-ranking:{post_id}:{pool["count"]}:{latest}:{StudentProfile.objects.data_version.get()}:'
+           f'{weights.key}')
+    ranking = cache.get(key)
+    if ranking is None:
+        ranking = rank(post_id, weights)
+        cache.set(key, ranking, settings.APPLICANT_RANKING_TIMEOUT)
+    return ranking
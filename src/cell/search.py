@@ -0,0 +1,178 @@
+from django.db import connection
+from django.db.models import Q, Value
+from django.db.models.expressions import RawSQL
+import re
+
+
+table = 'cell_recruitmentpost_search'
+columns = ['title', 'company', 'location', 'skills', 'description', 'requirements']
+
+
+def get_document(post):
+    return {
+        'title': post.title,
+        'company': post.company,
+        'location': post.location or '',
+        'skills': ' '.join(skill.name for skill in post.skills.all()),
+        'description': post.description,
+        'requirements': post.requirements,
+    }
+
+
+class SQLiteSearch:
+    weights = [10.0, 5.0, 2.0, 5.0, 1.0, 1.0]
+
+    def create(self, cursor):
+        cursor.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({", ".join(columns)})')
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    def index(self, cursor, post_id, document):
+        cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [post_id])
+        cursor.execute(f'INSERT INTO {table} (rowid, {", ".join(columns)}) VALUES (%s, {", ".join(["%s"] * len(columns))})',
+                       [post_id] + [document[column] for column in columns])
+
+    def remove(self, cursor, post_id):
+        cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [post_id])
+
+    def get_query(self, text, column=None):
+        terms = ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+        if column:
+            return f'{column} : ({terms})'
+        return terms
+
+    def matches(self, text, column=None):
+        return RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [self.get_query(text, column)])
+
+    def rank(self, text):
+        return RawSQL(f'SELECT -bm25({table}, {", ".join(map(str, self.weights))}) FROM {table} '
+                      f'WHERE {table} MATCH %s AND rowid = cell_recruitmentpost.id', [self.get_query(text)])
+
+
+class PostgreSQLSearch:
+    weights = {'title': 'A', 'company': 'B', 'skills': 'B', 'location': 'C', 'description': 'D', 'requirements': 'D'}
+    filter_columns = ['company', 'location']
+
+    def create(self, cursor):
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS {table} ('
+                       f'post_id bigint PRIMARY KEY REFERENCES cell_recruitmentpost (id) ON DELETE CASCADE, '
+                       f'document tsvector NOT NULL, company tsvector NOT NULL, location tsvector NOT NULL)')
+        for column in ['document'] + self.filter_columns:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} USING gin ({column})')
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    def index(self, cursor, post_id, document):
+        weighted = ' || '.join(f"setweight(to_tsvector('english', %s), '{self.weights[column]}')" for column in columns)
+        cursor.execute(f'INSERT INTO {table} (post_id, document, company, location) '
+                       f"VALUES (%s, {weighted}, to_tsvector('simple', %s), to_tsvector('simple', %s)) "
+                       f'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document, '
+                       f'company = EXCLUDED.company, location = EXCLUDED.location',
+                       [post_id] + [document[column] for column in columns + self.filter_columns])
+
+    def remove(self, cursor, post_id):
+        cursor.execute(f'DELETE FROM {table} WHERE post_id = %s', [post_id])
+
+    def get_query(self, text, config='english'):
+        terms = ' & '.join(f'{word}:*' for word in re.findall(r'\w+', text))
+        return f"to_tsquery('{config}', %s)", terms
+
+    def matches(self, text, column=None):
+        query, terms = self.get_query(text, 'simple' if column else 'english')
+        return RawSQL(f'SELECT post_id FROM {table} WHERE {column or "document"} @@ {query}', [terms])
+
+    def rank(self, text):
+        query, terms = self.get_query(text)
+        return RawSQL(f'SELECT ts_rank(document, {query}) FROM {table} WHERE post_id = cell_recruitmentpost.id',
+                      [terms])
+
+
+backends = {
+    'sqlite': SQLiteSearch,
+    'postgresql': PostgreSQLSearch,
+}
+
+
+def exists(cursor):
+    return table in connection.introspection.table_names(cursor)
+
+
+def is_populated(cursor):
+    cursor.execute(f'SELECT 1 FROM {table} LIMIT 1')
+    return cursor.fetchone() is not None
+
+
+def get_backend(populated=False):
+    backend = backends.get(connection.vendor)
+    if backend is None:
+        return None
+    with connection.cursor() as cursor:
+        if not exists(cursor) or (populated and not is_populated(cursor)):
+            return None
+    return backend()
+
+
+def has_terms(text):
+    return bool(text and re.search(r'\w', text))
+
+
+def index_post(post):
+    backend = get_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.index(cursor, post.pk, get_document(post))
+
+
+def remove_post(post_id):
+    backend = get_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.remove(cursor, post_id)
+
+
+def index_posts(cursor, backend, posts, batch_size):
+    count = 0
+    for post in posts.prefetch_related('skills').iterator(chunk_size=batch_size):
+        backend.index(cursor, post.pk, get_document(post))
+        count += 1
+    return count
+
+
+def create(posts, batch_size=500):
+    backend = backends.get(connection.vendor)
+    if backend is None:
+        return 0
+    backend = backend()
+    with connection.cursor() as cursor:
+        if exists(cursor):
+            return 0
+        backend.create(cursor)
+        return index_posts(cursor, backend, posts, batch_size)
+
+
+def rebuild(posts, batch_size=500):
+    backend = backends[connection.vendor]()
+    with connection.cursor() as cursor:
+        backend.drop(cursor)
+        backend.create(cursor)
+        return index_posts(cursor, backend, posts, batch_size)
+
+
+def filter_matches(text, column=None):
+    backend = get_backend(populated=True)
+    if backend is None:
+        return Q(**{f'{column or "title"}__icontains': text})
+    return Q(id__in=backend.matches(text, column))
+
+
+def search(queryset, text):
+    backend = get_backend(populated=True)
+    if backend is None:
+        return queryset.filter(
+            Q(title__icontains=text) | Q(company__icontains=text) | Q(description__icontains=text)
+        ).annotate(search_rank=Value(0.0))
+    return queryset.filter(id__in=backend.matches(text)).annotate(search_rank=backend.rank(text))
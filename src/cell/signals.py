@@ -0,0 +1,109 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from user.models import User
+from student.models import StudentProfile
+from resume.models import Skill
+from settings.models import Setting
+from .models import Notice, Message, Quote, RecruitmentPost, RecruitmentPostUpdate, RecruitmentApplication
+from . import stats, search
+
+
+def invalidate_dashboard_stats(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    stats.invalidate()
+
+
+for model in [RecruitmentApplication, RecruitmentPost, Message, User, StudentProfile, Notice, RecruitmentPostUpdate,
+              Quote, Setting]:
+    post_save.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard_stats_save_{model.__name__}')
+    post_delete.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard_stats_delete_{model.__name__}')
+
+
+def invalidate_applications_data(sender, instance, **kwargs):
+    RecruitmentApplication.objects.get_data_version(instance.recruitment_post_id).invalidate()
+
+
+post_save.connect(invalidate_applications_data, sender=RecruitmentApplication, dispatch_uid='applications_data_save')
+post_delete.connect(invalidate_applications_data, sender=RecruitmentApplication, dispatch_uid='applications_data_delete')
+
+
+def create_search_index(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    if using == DEFAULT_DB_ALIAS:
+        search.create(RecruitmentPost.objects.all())
+
+
+def index_recruitment_post(sender, instance, **kwargs):
+    search.index_post(instance)
+
+
+def remove_recruitment_post(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+
+
+def index_recruitment_post_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        search.index_post(instance)
+    elif pk_set:
+        for post in RecruitmentPost.objects.filter(pk__in=pk_set).prefetch_related('skills'):
+            search.index_post(post)
+
+
+post_save.connect(index_recruitment_post, sender=RecruitmentPost, dispatch_uid='search_index_recruitment_post')
+post_delete.connect(remove_recruitment_post, sender=RecruitmentPost, dispatch_uid='search_remove_recruitment_post')
+m2m_changed.connect(index_recruitment_post_skills, sender=RecruitmentPost.skills.through,
+                    dispatch_uid='search_index_recruitment_post_skills')
+
+
+def update_skill_counts(applications):
+    applications.update_skill_counts()
+    stats.invalidate()
+
+
+def user_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        users = [instance.pk]
+    elif action == 'pre_clear':
+        instance._cleared_user_ids = list(instance.users.values_list('pk', flat=True))
+        return
+    elif action == 'post_clear':
+        users = getattr(instance, '_cleared_user_ids', [])
+    else:
+        users = pk_set or []
+    if action in ['post_add', 'post_remove', 'post_clear'] and users:
+        update_skill_counts(RecruitmentApplication.objects.filter(user_id__in=users))
+
+
+def post_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        posts = [instance.pk]
+    elif action == 'pre_clear':
+        instance._cleared_post_ids = list(instance.jobs.values_list('pk', flat=True))
+        return
+    elif action == 'post_clear':
+        posts = getattr(instance, '_cleared_post_ids', [])
+    else:
+        posts = pk_set or []
+    if action in ['post_add', 'post_remove', 'post_clear'] and posts:
+        update_skill_counts(RecruitmentApplication.objects.filter(recruitment_post_id__in=posts))
+        for post in posts:
+            RecruitmentApplication.objects.get_data_version(post).invalidate()
+
+
+def skill_deleting(sender, instance, **kwargs):
+    instance._application_ids = list(RecruitmentApplication.objects.filter(
+        Q(user__skills=instance) | Q(recruitment_post__skills=instance)).values_list('pk', flat=True).distinct())
+
+
+def skill_deleted(sender, instance, **kwargs):
+    if getattr(instance, '_application_ids', None):
+        update_skill_counts(RecruitmentApplication.objects.filter(pk__in=instance._application_ids))
+
+
+m2m_changed.connect(user_skills_changed, sender=Skill.users.through, dispatch_uid='skill_counts_user_skills')
+m2m_changed.connect(post_skills_changed, sender=RecruitmentPost.skills.through, dispatch_uid='skill_counts_post_skills')
+pre_delete.connect(skill_deleting, sender=Skill, dispatch_uid='skill_counts_skill_deleting')
+post_delete.connect(skill_deleted, sender=Skill, dispatch_uid='skill_counts_skill_deleted')
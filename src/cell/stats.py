@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from datetime import datetime
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from caching import Version
+from user.models import User
+from student.models import StudentProfile
+from .models import Notice, Message, Quote, RecruitmentPost, RecruitmentApplication
+
+
+version = Version('dashboard-stats-version')
+
+
+def get_version():
+    return version.get()
+
+
+def invalidate():
+    version.invalidate()
+
+
+status_names = {
+    'P': 'pending',
+    'S': 'selected',
+    'R': 'rejected',
+    'I': 'shortlisted',
+}
+
+
+def status_counts(prefix, condition=Q()):
+    counts = {f'{prefix}_count': Count('id', filter=condition)}
+    for status, name in status_names.items():
+        counts[f'{name}_{prefix}_count'] = Count('id', filter=condition & Q(status=status))
+    return counts
+
+
+@dataclass
+class DashboardStats:
+    post_count: int = None
+    active_post_count: int = None
+    user_notice_count: int = None
+    total_notice_count: int = None
+    quotes_count: int = None
+
+    user_application_count: int = None
+    pending_user_application_count: int = None
+    selected_user_application_count: int = None
+    rejected_user_application_count: int = None
+    shortlisted_user_application_count: int = None
+
+    user_post_count: int = None
+    user_active_post_count: int = None
+    user_applicant_count: int = None
+    pending_user_applicant_count: int = None
+    selected_user_applicant_count: int = None
+    rejected_user_applicant_count: int = None
+    shortlisted_user_applicant_count: int = None
+    user_active_applicant_count: int = None
+    pending_user_active_applicant_count: int = None
+    selected_user_active_applicant_count: int = None
+    rejected_user_active_applicant_count: int = None
+    shortlisted_user_active_applicant_count: int = None
+
+    unapproved_user_count: int = None
+    unapproved_student_count: int = None
+    unapproved_staff_count: int = None
+    unapproved_recruiter_count: int = None
+    student_count: int = None
+    current_student_count: int = None
+    alumni_count: int = None
+    messages_count: int = None
+    handled_messages_count: int = None
+    unhandled_messages_count: int = None
+    applicant_count: int = None
+    pending_applicant_count: int = None
+    selected_applicant_count: int = None
+    rejected_applicant_count: int = None
+    shortlisted_applicant_count: int = None
+    active_applicant_count: int = None
+    pending_active_applicant_count: int = None
+    selected_active_applicant_count: int = None
+    rejected_active_applicant_count: int = None
+    shortlisted_active_applicant_count: int = None
+
+    @classmethod
+    def cached_for_user(cls, user):
+        key = f'dashboard-stats:{get_version()}:{user.pk}'
+        stats = cache.get(key)
+        if stats is None:
+            stats = cls.for_user(user)
+            cache.set(key, stats, settings.DASHBOARD_STATS_TIMEOUT)
+        return stats
+
+    @classmethod
+    def for_user(cls, user):
+        stats = cls()
+        is_admin = user.is_superuser or user.is_coordinator
+        is_poster = is_admin or user.role == 'recruiter'
+        today = datetime.today().date()
+        active = Q(recruitment_post__apply_by__gte=today)
+
+        stats.update(RecruitmentPost.objects.aggregate(
+            post_count=Count('id'),
+            active_post_count=Count('id', filter=Q(apply_by__gte=today)),
+            **({
+                'user_post_count': Count('id', filter=Q(user=user)),
+                'user_active_post_count': Count('id', filter=Q(user=user, apply_by__gte=today)),
+            } if is_poster else {})
+        ))
+
+        stats.update(Notice.objects.aggregate(
+            total_notice_count=Count('id'),
+            user_notice_count=Count('id', filter=Q(user=user)),
+        ))
+
+        if Quote.objects.get_create_permission(user, user):
+            stats.quotes_count = Quote.objects.count()
+
+        applications = {}
+        if user.role == 'student':
+            applications.update(status_counts('user_application', Q(user=user)))
+        if is_poster:
+            applications.update(status_counts('user_applicant', Q(recruitment_post__user=user)))
+            applications.update(status_counts('user_active_applicant', Q(recruitment_post__user=user) & active))
+        if is_admin:
+            applications.update(status_counts('applicant'))
+            applications.update(status_counts('active_applicant', active))
+        if applications:
+            stats.update(RecruitmentApplication.objects.aggregate(**applications))
+
+        if is_admin:
+            unapproved = Q(is_approved=False)
+            stats.update(User.objects.aggregate(
+                unapproved_user_count=Count('id', filter=unapproved),
+                unapproved_student_count=Count('id', filter=unapproved & Q(role='student')),
+                unapproved_staff_count=Count('id', filter=unapproved & Q(role='staff')),
+                unapproved_recruiter_count=Count('id', filter=unapproved & Q(role='recruiter')),
+            ))
+            stats.update(Message.objects.aggregate(
+                messages_count=Count('id'),
+                handled_messages_count=Count('id', filter=Q(handled=True)),
+                unhandled_messages_count=Count('id', filter=Q(handled=False)),
+            ))
+            stats.update(StudentProfile.objects.filter(user__is_approved=True).aggregate(
+                student_count=Count('id'),
+                current_student_count=Count('id', filter=Q(is_current=True)),
+                alumni_count=Count('id', filter=Q(passed_out=True)),
+            ))
+
+        return stats
+
+    def update(self, counts):
+        for key, value in counts.items():
+            setattr(self, key, value)
@@ -1,3 +1,239 @@
+from datetime import datetime
+from unittest import skipUnless
+from unittest.mock import patch
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
 from django.test import TestCase
+from django.urls import reverse
+from student.models import StudentProfile
+from recruiter.models import RecruiterProfile
+from resume.models import Skill
+from pagination import encode_cursor, decode_cursor, seek
+from testing import create_user
+from .models import RecruitmentPost, RecruitmentApplication
+from .views import RecruitmentApplications
+from . import ranking, search
 
-# Create your tests here.
+
+class RecruitmentApplicationsQueryCountTest(TestCase):
+    queries = 17
+
+    def setUp(self):
+        self.recruiter = create_user('recruiter', 'recruiter')
+        RecruiterProfile.objects.create(user=self.recruiter, company_name='Acme', designation='HR')
+        self.skills = [Skill.objects.create(name=name) for name in ['Python', 'Django', 'SQL']]
+        self.post = RecruitmentPost.objects.create(user=self.recruiter, title='Developer', company='Acme',
+                                                   description='Build things', location='Delhi')
+        self.post.skills.add(*self.skills[:2])
+        self.applicants = 0
+
+    def add_applicants(self, count):
+        for index in range(self.applicants, self.applicants + count):
+            user = create_user(f'student{index}', 'student')
+            profile = StudentProfile.objects.create(user=user, registration_number=20210000000 + index, course='B.Tech',
+                                                    number=1000000000 + index, id_number=index + 1)
+            profile.save()
+            user.skills.add(*self.skills[:index % 3 + 1])
+            RecruitmentApplication.objects.create(user=user, recruitment_post=self.post, cover_letter='Hello',
+                                                  status='PRSI'[index % 4])
+        self.applicants += count
+
+    def assert_page_queries(self, rows):
+        with self.assertNumQueries(self.queries):
+            response = self.client.get(reverse('recruitment_applications', args=[self.post.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['page_obj']), rows)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.client.force_login(self.recruiter)
+        self.add_applicants(10)
+        self.assert_page_queries(10)
+        self.add_applicants(90)
+        self.assert_page_queries(100)
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.recruiter = create_user('recruiter', 'recruiter')
+        RecruiterProfile.objects.create(user=self.recruiter, company_name='Acme', designation='HR')
+        self.developer = RecruitmentPost.objects.create(user=self.recruiter, title='Python Developer', company='Acme Labs',
+                                                        description='Build web services', location='Delhi')
+        self.analyst = RecruitmentPost.objects.create(user=self.recruiter, title='Data Analyst', company='Globex',
+                                                      description='Reports written in Python', location='Mumbai')
+        self.developer.skills.add(Skill.objects.create(name='Django'))
+
+    def search(self, text):
+        return list(search.search(RecruitmentPost.objects.all(), text).order_by('-search_rank', 'pk'))
+
+    def filter(self, text, column):
+        return list(RecruitmentPost.objects.filter(search.filter_matches(text, column)))
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(self.search('python'), [self.developer, self.analyst])
+        self.assertEqual(self.search('djan'), [self.developer])
+        self.assertEqual(self.search('cobol'), [])
+
+    def test_search_follows_post_changes(self):
+        self.analyst.title = 'Django Analyst'
+        self.analyst.save()
+        self.assertEqual(set(self.search('django')), {self.developer, self.analyst})
+        self.developer.delete()
+        self.assertEqual(self.search('django'), [self.analyst])
+
+    def test_company_and_location_filters(self):
+        self.assertEqual(self.filter('acme', 'company'), [self.developer])
+        self.assertEqual(self.filter('mum', 'location'), [self.analyst])
+        self.assertEqual(self.filter('delhi', 'company'), [])
+
+    def test_filters_fall_back_until_index_is_populated(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {search.table}')
+        self.assertEqual(self.filter('labs', 'company'), [self.developer])
+        self.assertEqual(self.filter('mumbai', 'location'), [self.analyst])
+        self.assertEqual(set(self.search('python')), {self.developer, self.analyst})
+
+    def test_list_view_filters(self):
+        self.client.force_login(self.recruiter)
+        response = self.client.get(reverse('recruitment_posts'), {
+            'company-filter': 'acme', 'location-filter': 'delhi', 'is-active-filter': 'false'})
+        self.assertEqual(list(response.context['object_list']), [self.developer])
+        response = self.client.get(reverse('recruitment_posts'), {'q': 'python', 'is-active-filter': 'false'})
+        self.assertEqual(list(response.context['object_list']), [self.developer, self.analyst])
+
+
+class CursorPaginationTest(TestCase):
+    ordering = [('applied_on', True), ('pk', True)]
+
+    def setUp(self):
+        self.recruiter = create_user('recruiter', 'recruiter')
+        RecruiterProfile.objects.create(user=self.recruiter, company_name='Acme', designation='HR')
+        self.post = RecruitmentPost.objects.create(user=self.recruiter, title='Developer', company='Acme',
+                                                   description='Build things', location='Delhi')
+        self.post.skills.add(Skill.objects.create(name='Python'))
+        for index in range(12):
+            user = create_user(f'student{index:02}', 'student')
+            profile = StudentProfile.objects.create(user=user, registration_number=20210000000 + index, course='B.Tech',
+                                                    number=1000000000 + index, id_number=index + 1)
+            StudentProfile.objects.filter(pk=profile.pk).update(cgpa=6 + index % 3, backlog_count=index % 2)
+            RecruitmentApplication.objects.create(user=user, recruitment_post=self.post, cover_letter='Hello')
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(self.ordering, [datetime(2024, 1, 2, 3, 4, 5), 7], True)
+        self.assertEqual(decode_cursor(cursor, self.ordering), (['2024-01-02T03:04:05', 7], True))
+
+    def test_tampered_cursor_is_ignored(self):
+        cursor = encode_cursor(self.ordering, ['2024-01-02T03:04:05', 7])
+        self.assertEqual(decode_cursor(cursor[:-4], self.ordering), (None, False))
+        self.assertEqual(decode_cursor('not a cursor', self.ordering), (None, False))
+        self.assertEqual(decode_cursor(cursor, [('cgpa', False), ('pk', False)]), (None, False))
+        self.assertEqual(decode_cursor(encode_cursor(self.ordering, [7]), self.ordering), (None, False))
+
+    def test_seek(self):
+        applications = list(RecruitmentApplication.objects.order_by('pk'))
+        after = RecruitmentApplication.objects.filter(seek([('pk', False)], [applications[3].pk], False))
+        self.assertEqual(list(after.order_by('pk')), applications[4:])
+        before = RecruitmentApplication.objects.filter(seek([('pk', True)], [applications[3].pk], False))
+        self.assertEqual(list(before.order_by('pk')), applications[:3])
+
+    def get_page(self, params):
+        response = self.client.get(reverse('recruitment_applications', args=[self.post.pk]), params)
+        return response.context['page_obj']
+
+    def walk(self, sorting, ordering):
+        seen, params = [], {'sorting': sorting, 'ordering': ordering, 'pagination': 'cursor'}
+        while True:
+            page = self.get_page(params)
+            seen += list(page.object_list)
+            if not page.next_cursor:
+                return seen
+            params['cursor'] = page.next_cursor
+
+    @patch.object(RecruitmentApplications, 'paginate_by', 5)
+    def test_every_sort_pages_by_cursor(self):
+        self.client.force_login(self.recruiter)
+        keys = {
+            'applied_on': lambda application: application.applied_on,
+            'name': lambda application: application.user.first_name,
+            'cgpa': lambda application: application.user.student_profile.cgpa,
+            'backlogs': lambda application: application.user.student_profile.backlog_count,
+            'skill_matches': lambda application: application.skill_matches,
+        }
+        for sorting, key in keys.items():
+            for ordering in ['asc', 'desc']:
+                seen = self.walk(sorting, ordering)
+                expected = sorted(seen, key=lambda application: (key(application), application.pk),
+                                  reverse=ordering == 'desc')
+                self.assertEqual(seen, expected, (sorting, ordering))
+                self.assertEqual(len(set(seen)), 12, (sorting, ordering))
+
+    @patch.object(RecruitmentApplications, 'paginate_by', 5)
+    def test_previous_cursor_returns_the_previous_page(self):
+        self.client.force_login(self.recruiter)
+        first = self.get_page({'sorting': 'cgpa', 'pagination': 'cursor'})
+        second = self.get_page({'sorting': 'cgpa', 'pagination': 'cursor', 'cursor': first.next_cursor})
+        previous = self.get_page({'sorting': 'cgpa', 'pagination': 'cursor', 'cursor': second.previous_cursor})
+        self.assertEqual(previous.object_list, first.object_list)
+        tampered = self.get_page({'sorting': 'name', 'pagination': 'cursor', 'cursor': first.next_cursor})
+        self.assertFalse(tampered.has_previous)
+
+
+class RankingTest(TestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+        self.recruiter = create_user('recruiter', 'recruiter')
+        self.post = RecruitmentPost.objects.create(user=self.recruiter, title='Developer', company='Acme',
+                                                   description='Build things')
+        self.skills = [Skill.objects.create(name=name) for name in ['Python', 'Django']]
+        self.post.skills.add(*self.skills)
+        self.profiles = [self.apply(index) for index in range(4)]
+
+    def apply(self, index, cgpa=8):
+        user = create_user(f'student{index}', 'student')
+        profile = StudentProfile.objects.create(user=user, registration_number=20210000000 + index, course='B.Tech',
+                                                number=1000000000 + index, id_number=index + 1)
+        StudentProfile.objects.filter(pk=profile.pk).update(cgpa=cgpa)
+        RecruitmentApplication.objects.create(user=user, recruitment_post=self.post, cover_letter='Hello')
+        return profile
+
+    def get_weights(self, query=''):
+        return ranking.RankingWeights.from_query(QueryDict(query), {skill.pk for skill in self.skills})
+
+    def test_weights_reject_bad_values(self):
+        python, django = (skill.pk for skill in self.skills)
+        weights = self.get_weights(f'rank-skills=abc&rank-cgpa=nan&rank-backlogs=-3&rank-year=50&rank-course=inf&'
+                                   f'required-skills={python}&required-skills=9999&required-skills=x&'
+                                   f'preferred-courses=B.Tech&preferred-courses=MBA')
+        self.assertEqual(weights, ranking.RankingWeights(
+            skills=1.0, cgpa=1.0, backlogs=0.0, year=10.0, course=0.0, required_skills=(python,),
+            optional_skills=(django,), preferred_courses=('B.Tech',)))
+
+    @skipUnless(ranking.np, 'numpy is not installed')
+    def test_ties_are_ranked_by_application(self):
+        applications = list(RecruitmentApplication.objects.order_by('pk').values_list('pk', flat=True))
+        self.assertEqual(ranking.rank(self.post.pk, self.get_weights()).application_ids, applications)
+
+        self.skills[0].users.add(self.profiles[2].user)
+        result = ranking.get_ranking(self.post.pk, self.get_weights())
+        self.assertEqual(result.application_ids, [applications[2]] + applications[:2] + applications[3:])
+        self.assertEqual(ranking.rank(self.post.pk, self.get_weights()), result)
+
+    @skipUnless(ranking.np, 'numpy is not installed')
+    def test_cached_ranking_follows_the_post_applications(self):
+        other = RecruitmentPost.objects.create(user=self.recruiter, title='Tester', company='Acme',
+                                               description='Test things')
+        weights = self.get_weights()
+        result = ranking.get_ranking(self.post.pk, weights)
+        self.assertEqual(len(result.application_ids), 4)
+
+        other.title = 'QA'
+        other.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(ranking.get_ranking(self.post.pk, weights), result)
+
+        self.apply(4, cgpa=10)
+        application = RecruitmentApplication.objects.get(user__first_name='student4')
+        self.assertEqual(ranking.get_ranking(self.post.pk, weights).application_ids[0], application.pk)
+
+        application.delete()
+        self.assertEqual(ranking.get_ranking(self.post.pk, weights), result)
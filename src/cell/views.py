@@ -1,21 +1,21 @@
 from django.db.models import Count, Q, Prefetch
 from django.shortcuts import render, redirect, reverse
 from staff.models import StaffProfile
-from settings.models import Setting
 from user.models import User, Link
 from resume.models import Skill
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse
 from django.utils.decorators import method_decorator
-from views import AddUserKeyObject, ChangeUserKeyObject, AddObject, DeleteUserKeyObject
+from views import AddUserKeyObject, ChangeUserKeyObject, AddObject, DeleteUserKeyObject, PermissionMatrixMixin, CursorPaginationMixin, CSVStreamMixin
 from django.views.generic.base import View, TemplateView
 from django.views.generic.list import ListView
 from django.core.exceptions import PermissionDenied, ObjectDoesNotExist, BadRequest
 from student.models import StudentProfile, SemesterReportCard
 from .forms import *
 from .models import Notice, Quote
+from .stats import DashboardStats
+from . import search, ranking, stats
 import json
-import csv
 from itertools import chain
 
 # Create your views here.
@@ -29,12 +29,6 @@ class Index(TemplateView):
         if Quote.objects.exists():
             context['quote'] = Quote.objects.order_by('?').values().first()
 
-        current_academic_half, created = Setting.objects.get_or_create(
-            key='current_academic_half')
-        if current_academic_half.value == None:
-            current_academic_half.value = 'odd'
-            current_academic_half.save()
-
         links = Link.objects.filter(title__in=['Portfolio', 'Website', 'GitHub', 'LinkedIn'])
 
         users = User.objects.filter(
@@ -86,106 +80,18 @@ class Dashboard(TemplateView):
 
         if Quote.objects.get_create_permission(user, user):
             context['add_quote_form'] = QuoteForm(initial={'user': user})
-            context['quotes_count'] = Quote.objects.count()
-
-        if user.role == 'student':
-            self.add_student_context(context, user)
-
-        if user.is_superuser or user.is_coordinator or user.role == 'recruiter':
-            self.add_recruiter_context(context, user)
-
-        if user.is_superuser or user.is_coordinator:
-            self.add_admin_context(context)
 
-        context.update(self.add_general_context())
+        context['stats'] = DashboardStats.cached_for_user(user)
 
         return context
 
-    def add_student_context(self, context, user):
-        user_applications = RecruitmentApplication.objects.filter(user=user).values('status')
-        context.update({
-            'user_application_count': user_applications.count(),
-            'pending_user_application_count': user_applications.filter(status='P').count(),
-            'selected_user_application_count': user_applications.filter(status='S').count(),
-            'rejected_user_application_count': user_applications.filter(status='R').count(),
-            'shortlisted_user_application_count': user_applications.filter(status='I').count(),
-        })
-
-    def add_recruiter_context(self, context, user):
-        user_posts = RecruitmentPost.objects.filter(user=user).values('id', 'apply_by')
-        active_user_posts = user_posts.filter(
-            apply_by__gte=datetime.today().date())
-        user_applicants = RecruitmentApplication.objects.filter(
-            recruitment_post_id__in=user_posts.values('id'))
-        active_user_applicants = user_applicants.filter(
-            recruitment_post_id__in=active_user_posts.values('id'))
-
-        context.update({
-            'user_post_count': user_posts.count(),
-            'user_active_post_count': active_user_posts.count(),
-            'user_applicant_count': user_applicants.count(),
-            'pending_user_applicant_count': user_applicants.filter(status='P').count(),
-            'selected_user_applicant_count': user_applicants.filter(status='S').count(),
-            'rejected_user_applicant_count': user_applicants.filter(status='R').count(),
-            'shortlisted_user_applicant_count': user_applicants.filter(status='I').count(),
-            'user_active_applicant_count': active_user_applicants.count(),
-            'pending_user_active_applicant_count': active_user_applicants.filter(status='P').count(),
-            'selected_user_active_applicant_count': active_user_applicants.filter(status='S').count(),
-            'rejected_user_active_applicant_count': active_user_applicants.filter(status='R').count(),
-            'shortlisted_user_active_applicant_count': active_user_applicants.filter(status='I').count(),
-        })
-
-    def add_admin_context(self, context):
-        unapproved_users = User.objects.filter(is_approved=False).values('role')
-        students = StudentProfile.objects.filter(user__is_approved=True).values('is_current', 'passed_out')
-        applicants = RecruitmentApplication.objects.all().values('status', 'recruitment_post_id')
-        active_applicants = applicants.filter(
-            recruitment_post__in=RecruitmentPost.objects.filter(
-                apply_by__gte=datetime.today().date())
-        )
-        messages = Message.objects.all()
-
-        context.update({
-            'unapproved_user_count': unapproved_users.count(),
-            'unapproved_student_count': unapproved_users.filter(role='student').count(),
-            'unapproved_staff_count': unapproved_users.filter(role='staff').count(),
-            'unapproved_recruiter_count': unapproved_users.filter(role='recruiter').count(),
-            'student_count': students.count(),
-            'current_student_count': students.filter(is_current=True).count(),
-            'alumni_count': students.filter(passed_out=True).count(),
-            'messages_count': messages.count(),
-            'handled_messages_count': messages.filter(handled=True).count(),
-            'unhandled_messages_count': messages.filter(handled=False).count(),
-            'applicant_count': applicants.count(),
-            'pending_applicant_count': applicants.filter(status='P').count(),
-            'selected_applicant_count': applicants.filter(status='S').count(),
-            'rejected_applicant_count': applicants.filter(status='R').count(),
-            'shortlisted_applicant_count': applicants.filter(status='I').count(),
-            'active_applicant_count': active_applicants.count(),
-            'pending_active_applicant_count': active_applicants.filter(status='P').count(),
-            'selected_active_applicant_count': active_applicants.filter(status='S').count(),
-            'rejected_active_applicant_count': active_applicants.filter(status='R').count(),
-            'shortlisted_active_applicant_count': active_applicants.filter(status='I').count(),
-        })
-
-    def add_general_context(self):
-        active_posts = RecruitmentPost.objects.filter(
-            apply_by__gte=datetime.today().date())
-        user_notices = Notice.objects.filter(user=self.request.user)
-        all_notices = Notice.objects.all()
-
-        return {
-            'post_count': RecruitmentPost.objects.count(),
-            'active_post_count': active_posts.count(),
-            'user_notice_count': len(user_notices),
-            'total_notice_count': len(all_notices),
-        }
-
-
-class ListNotice(ListView):
+
+class ListNotice(CursorPaginationMixin, PermissionMatrixMixin, ListView):
     model = Notice
     template_name = 'notices.html'
     paginate_by = 50
+    permission_actions = ['edit']
+    cursor_fields = ['date', 'title']
 
     sorting_options = [
         ('date', 'Date'),
@@ -265,8 +171,11 @@ class ListNotice(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['page_obj'].object_list = [(RecruitmentPostUpdate.objects.get(notice_ptr_id=notice.id) if notice.kind == 'U' else notice, RecruitmentPostUpdateForm(instance=notice) if notice.kind == 'U' else NoticeForm(instance=notice))
-                                           for notice in context['page_obj'].object_list]
+        notices = context['page_obj'].object_list
+        updates = RecruitmentPostUpdate.objects.select_related('user', 'recruitment_post__user').in_bulk(
+            [notice.pk for notice in notices if notice.kind == 'U'])
+        context['page_obj'].object_list = [self.get_row(updates.get(notice.pk, notice), context['permissions'])
+                                           for notice in notices]
         context['sorting_options'] = self.sorting_options.copy()
 
         context['type_options'] = self.type_options
@@ -290,11 +199,19 @@ class ListNotice(ListView):
         context['ordering'] = self.request.GET.get('ordering', 'desc')
         return context
 
+    def get_row(self, notice, permissions):
+        if 'edit' not in permissions.actions_for(notice):
+            return (notice, None)
+        if isinstance(notice, RecruitmentPostUpdate):
+            return (notice, RecruitmentPostUpdateForm(instance=notice))
+        return (notice, NoticeForm(instance=notice))
+
 
-class ListRecruitmentPost(ListView):
+class ListRecruitmentPost(CursorPaginationMixin, ListView):
     model = RecruitmentPost
     template_name = 'recruitment_posts.html'
     paginate_by = 50
+    cursor_fields = ['apply_by', 'experience_duration']
 
     job_type_choices = RecruitmentPost.job_type_choices
     workplace_type_choices = RecruitmentPost.workplace_type_choices
@@ -308,6 +225,11 @@ class ListRecruitmentPost(ListView):
         ('', 'Any Post'),
         ('applied-by-me', 'Applied by me'),
     ]
+    sorting_options = [
+        ('apply_by', 'Apply By date'),
+        ('start_date', 'Start date'),
+        ('experience_duration', 'Experience duration'),
+    ]
 
     def get_queryset(self):
         query = Q()
@@ -324,12 +246,24 @@ class ListRecruitmentPost(ListView):
         query = self.apply_applications_status_filters(query)
         query = self.apply_active_filter(query)
 
-        queryset = super().get_queryset().select_related('user').prefetch_related(
-            Prefetch('skills', queryset=Skill.objects.all())
+        applications = RecruitmentApplication.objects.none()
+        if self.request.user.is_authenticated:
+            applications = RecruitmentApplication.objects.filter(user=self.request.user)
+        queryset = super().get_queryset().select_related(
+            'user', 'user__recruiter_profile', 'user__staff_profile'
+        ).prefetch_related(
+            Prefetch('skills', queryset=Skill.objects.all()),
+            Prefetch('applications', queryset=applications)
         ).filter(query).distinct()
 
-        sorting = self.request.GET.get('sorting', 'apply_by')
-        if sorting:
+        search_query = self.request.GET.get('q')
+        if search.has_terms(search_query):
+            queryset = search.search(queryset, search_query)
+
+        sorting = self.request.GET.get('sorting', 'relevance' if search.has_terms(search_query) else 'apply_by')
+        if sorting == 'relevance' and search.has_terms(search_query):
+            queryset = queryset.order_by('-search_rank', 'pk')
+        elif sorting in [option[0] for option in self.sorting_options]:
             queryset = queryset.order_by(sorting)
 
         ordering = self.request.GET.get('ordering')
@@ -345,14 +279,14 @@ class ListRecruitmentPost(ListView):
 
     def apply_company_filter(self, query):
         company_filter = self.request.GET.get('company-filter')
-        if company_filter:
-            query &= Q(company__icontains=company_filter)
+        if search.has_terms(company_filter):
+            query &= search.filter_matches(company_filter, 'company')
         return query
 
     def apply_location_filter(self, query):
         location_filter = self.request.GET.get('location-filter')
-        if location_filter:
-            query &= Q(location__icontains=location_filter)
+        if search.has_terms(location_filter):
+            query &= search.filter_matches(location_filter, 'location')
         return query
 
     def apply_job_type_filters(self, query):
@@ -498,12 +432,17 @@ class ListRecruitmentPost(ListView):
                     'applications-status-filters', [])
                 context['applications_status_choices'] = self.applications_status_choices
 
-        context['sorting_options'] = [
-            ('apply_by', 'Apply By date'),
-            ('start_date', 'Start date'),
-            ('experience_duration', 'Experience duration'),
-        ]
-        context['sorting'] = self.request.GET.get('sorting', 'apply_by')
+        context['user_skills'] = []
+        if self.request.user.is_authenticated and self.request.user.role == 'student':
+            context['user_skills'] = list(self.request.user.skills.all())
+
+        context['search_query'] = self.request.GET.get('q', '')
+        context['sorting_options'] = self.sorting_options.copy()
+        if search.has_terms(context['search_query']):
+            context['sorting_options'] = [('relevance', 'Relevance')] + context['sorting_options']
+            context['sorting'] = self.request.GET.get('sorting', 'relevance')
+        else:
+            context['sorting'] = self.request.GET.get('sorting', 'apply_by')
         context['ordering'] = self.request.GET.get('ordering', 'asc')
 
         return context
@@ -623,10 +562,11 @@ class MessageListView(ListView):
 
 
 @method_decorator(login_required, name="dispatch")
-class QuoteListView(ListView):
+class QuoteListView(PermissionMatrixMixin, ListView):
     model = Quote
     template_name = 'quotes.html'
     paginate_by = 50
+    permission_actions = ['edit', 'delete']
 
     sorting_options = [
         ('date', 'Date'),
@@ -788,10 +728,14 @@ class ViewRecruitmentPost(TemplateView):
 
 
 @method_decorator(login_required, name="dispatch")
-class RecruitmentApplications(ListView):
+class RecruitmentApplications(CursorPaginationMixin, PermissionMatrixMixin, ListView):
     model = RecruitmentApplication
     paginate_by = 100
     template_name = 'recruitment_applications.html'
+    permission_actions = ['select', 'reject', 'shortlist', 'pending']
+    cursor_fields = ['applied_on', 'user__first_name', 'skills_count', 'skill_matches', 'other_skills_count',
+                     'user__student_profile__course', 'user__student_profile__year', 'user__student_profile__cgpa',
+                     'user__student_profile__backlog_count']
 
     course_choices = StudentProfile.course_choices
     status_choices = RecruitmentApplication.status_choices
@@ -806,6 +750,19 @@ class RecruitmentApplications(ListView):
         ('cgpa', 'CGPA'),
         ('backlogs', 'Backlogs'),
     ]
+    bulk_status_options = [
+        ('I', 'Shortlist Pending for Interview'),
+        ('S', 'Select Pending'),
+        ('R', 'Reject Pending'),
+        ('P', 'Set All as Pending'),
+    ]
+    ranking_weight_options = [
+        ('skills', 'Skills'),
+        ('cgpa', 'CGPA'),
+        ('backlogs', 'Few backlogs'),
+        ('year', 'Year'),
+        ('course', 'Course'),
+    ]
 
     def get_queryset(self):
         skill_filters = self.request.GET.get('skill-filters')
@@ -857,18 +814,9 @@ class RecruitmentApplications(ListView):
         if status_filters:
             query &= Q(status__in=status_filters)
 
-        student_users = User.objects.prefetch_related(
-            Prefetch('skills', queryset=Skill.objects.all()),
-            Prefetch(
-                'student_profile',
-                queryset=StudentProfile.objects.all()
-                    .prefetch_related(
-                        Prefetch('semester_report_cards', queryset=SemesterReportCard.objects.all().only('sgpa', 'backlogs', 'is_complete'))
-                    ).only('cgpa', 'backlog_count')
-            )
-        ).filter(role='student').only('full_name', 'primary_email', 'primary_phone_number', 'primary_address', 'bio')
         queryset = super().get_queryset().prefetch_related(
-            Prefetch('user', queryset=student_users)
+            Prefetch('recruitment_post', queryset=RecruitmentPost.objects.prefetch_related('skills')),
+            Prefetch('user', queryset=self.get_student_users())
         ).filter(query).distinct()
 
         if sorting:
@@ -899,11 +847,59 @@ class RecruitmentApplications(ListView):
 
         return queryset
 
+    def get_student_users(self):
+        return User.objects.select_related('primary_email', 'primary_phone_number', 'primary_address').prefetch_related(
+            Prefetch('skills', queryset=Skill.objects.all()),
+            Prefetch(
+                'student_profile',
+                queryset=StudentProfile.objects.all()
+                    .prefetch_related(
+                        Prefetch('semester_report_cards', queryset=SemesterReportCard.objects.all().only('student_profile', 'semester_number', 'sgpa', 'backlogs', 'is_complete'))
+                    ).only('user', 'course', 'year', 'semester', 'is_current', 'passed_out', 'dropped_out', 'cgpa',
+                           'backlog_count')
+            )
+        ).filter(role='student').only('first_name', 'full_name', 'role', 'is_superuser', 'is_coordinator', 'is_developer',
+                                      'primary_email', 'primary_phone_number', 'primary_address', 'bio')
+
+    def is_ranked(self):
+        return self.request.GET.get('sorting') == 'rank' and ranking.np is not None
+
+    def get_ranking_weights(self):
+        post_skills = RecruitmentPost.skills.through.objects.filter(
+            recruitmentpost_id=self.kwargs['pk']).values_list('skill_id', flat=True)
+        return ranking.RankingWeights.from_query(self.request.GET, set(post_skills))
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.is_ranked():
+            return super().paginate_queryset(queryset, page_size)
+
+        result = ranking.get_ranking(self.kwargs['pk'], self.get_ranking_weights())
+        allowed = set(queryset.values_list('pk', flat=True))
+        application_ids = [pk for pk in result.application_ids if pk in allowed]
+        if self.request.GET.get('ordering') == 'desc':
+            application_ids.reverse()
+
+        paginator, page, application_ids, is_paginated = super(CursorPaginationMixin, self).paginate_queryset(
+            application_ids, page_size)
+        applications = queryset.in_bulk(application_ids)
+        page.object_list = [applications[pk] for pk in application_ids if pk in applications]
+        for application in page.object_list:
+            application.rank_score = result.scores[application.pk]
+        return (paginator, page, page.object_list, is_paginated)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         context['post'] = RecruitmentPost.objects.get(pk=self.kwargs['pk'])
         context['sorting_options'] = self.sorting_options
+        context['bulk_status_options'] = self.bulk_status_options
+        if ranking.np is not None:
+            context['sorting_options'] = self.sorting_options + [('rank', 'Rank Score')]
+            context['ranking_weights'] = self.get_ranking_weights()
+            context['ranking_weight_fields'] = [
+                (name, label, getattr(context['ranking_weights'], name)) for name, label in self.ranking_weight_options]
+            context['course_choices'] = self.course_choices
+            context['ranked'] = self.is_ranked()
 
         skill_filters = self.request.GET.get('skill-filters', [])
         course_filters = self.request.GET.getlist('course-filters', [])
@@ -965,74 +961,65 @@ class RecruitmentApplications(ListView):
 
 
 @method_decorator(login_required, name="dispatch")
-class RecruitmentApplicationsCSV(RecruitmentApplications):
+class RecruitmentApplicationsCSV(CSVStreamMixin, RecruitmentApplications):
     content_type = 'text/csv'
+    csv_filename = 'applications.csv'
+
+    @classmethod
+    def has_export_permission(cls, user, pk):
+        post = RecruitmentPost.objects.filter(pk=pk).first()
+        return post is not None and user in post.view_application_users
 
     def get(self, request, pk):
         if not RecruitmentPost.objects.filter(pk=pk).exists():
             raise ObjectDoesNotExist()
-        if request.user not in RecruitmentPost.objects.get(pk=pk).view_application_users:
+        if not self.has_export_permission(request.user, pk):
             raise PermissionDenied()
 
-        queryset = self.get_queryset()
+        return self.stream_csv(self.get_queryset())
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="applications.csv"'
+    def get_student_users(self):
+        return User.objects.select_related('primary_email', 'primary_phone_number', 'primary_address').prefetch_related(
+            Prefetch('skills', queryset=Skill.objects.all()),
+            Prefetch('student_profile', queryset=StudentProfile.objects.all())
+        ).filter(role='student')
+
+    def get_export_stamp(self):
+        return [StudentProfile.objects.data_version.get(),
+                RecruitmentApplication.objects.get_data_version(self.kwargs['pk']).get()]
 
-        writer = csv.writer(response)
+    def get_csv_header(self):
+        return ['Name', 'Application Status', 'Applied On', 'Cover Letter', 'Answers', 'Bio', 'Email', 'Phone number',
+                'Address', 'Registration Year', 'Registration Number', 'Roll Number', 'Course', 'Year', 'CGPA',
+                'Backlogs', 'Pass Out Year', 'Skills', 'Resume URL']
 
+    def get_csv_row(self, application):
         row = []
-        row.append('Name')
-        row.append('Application Status')
-        row.append('Applied On')
-        row.append('Cover Letter')
-        row.append('Answers')
-        row.append('Bio')
-        row.append('Email')
-        row.append('Phone number')
-        row.append('Address')
-        row.append('Registration Year')
-        row.append('Registration Number')
-        row.append('Roll Number')
-        row.append('Course')
-        row.append('Year')
-        row.append('CGPA')
-        row.append('Backlogs')
-        row.append('Pass Out Year')
-        row.append('Skills')
-        row.append('Resume URL')
-
-        writer.writerow(row)
-
-        for application in queryset:
-            row = []
-            row.append(application.user.full_name)
-            row.append(application.get_status_display())
-            row.append(application.applied_on)
-            row.append(application.cover_letter)
-            row.append(application.answers)
-            row.append(application.user.bio)
-            row.append(
-                application.user.primary_email.email if application.user.primary_email else '')
-            row.append(application.user.primary_phone_number.__str__()
-                       if application.user.primary_phone_number else '')
-            row.append(f'{application.user.primary_address.address}, {application.user.primary_address.city}, {application.user.primary_address.state}, {application.user.primary_address.country}, {application.user.primary_address.pincode}' if application.user.primary_address else '')
-            row.append(application.user.student_profile.registration_year)
-            row.append(application.user.student_profile.registration_number)
-            row.append(
-                f'{application.user.student_profile.roll}-{application.user.student_profile.number}')
-            row.append(application.user.student_profile.course)
-            row.append(application.user.student_profile.year)
-            row.append(application.user.student_profile.cgpa)
-            row.append(application.user.student_profile.backlog_count)
-            row.append(application.user.student_profile.pass_out_year)
-            row.append(
-                ', '.join([skill.name for skill in application.user.skills.all()]))
-            row.append(request.build_absolute_uri(
-                reverse('resume', args=[application.user.id])))
-            writer.writerow(row)
-
-        return response
+        row.append(application.user.full_name)
+        row.append(application.get_status_display())
+        row.append(application.applied_on)
+        row.append(application.cover_letter)
+        row.append(application.answers)
+        row.append(application.user.bio)
+        row.append(
+            application.user.primary_email.email if application.user.primary_email else '')
+        row.append(application.user.primary_phone_number.__str__()
+                   if application.user.primary_phone_number else '')
+        row.append(f'{application.user.primary_address.address}, {application.user.primary_address.city}, {application.user.primary_address.state}, {application.user.primary_address.country}, {application.user.primary_address.pincode}' if application.user.primary_address else '')
+        row.append(application.user.student_profile.registration_year)
+        row.append(application.user.student_profile.registration_number)
+        row.append(
+            f'{application.user.student_profile.roll}-{application.user.student_profile.number}')
+        row.append(application.user.student_profile.course)
+        row.append(application.user.student_profile.year)
+        row.append(application.user.student_profile.cgpa)
+        row.append(application.user.student_profile.backlog_count)
+        row.append(application.user.student_profile.pass_out_year)
+        row.append(
+            ', '.join([skill.name for skill in application.user.skills.all()]))
+        row.append(self.build_absolute_uri(
+            reverse('resume', args=[application.user.id])))
+        return row
 
 
 @method_decorator(login_required, name="dispatch")
@@ -1344,6 +1331,72 @@ class PendingRecruitmentApplication(ApplicationPerformAction):
         return super().post(request, pk, 'P')
 
 
+@method_decorator(login_required, name="dispatch")
+class BulkRecruitmentApplicationStatus(RecruitmentApplications):
+    http_method_names = ['post']
+    status_actions = [
+        ('S', 'select_application_users', 'select_recruitment_application', 'Select'),
+        ('R', 'reject_application_users', 'reject_recruitment_application', 'Reject'),
+        ('I', 'shortlist_application_users', 'shortlist_recruitment_application', 'Shortlist'),
+        ('P', 'pending_application_users', 'pending_recruitment_application', 'Set as Pending'),
+    ]
+
+    def get_actions(self, pk, status, permitted):
+        return [
+            {'name': name, 'url': reverse(url_name, args=[pk])}
+            for action, users, url_name, name in self.status_actions
+            if action in permitted and status in RecruitmentApplication.status_transitions[action]
+        ]
+
+    def post(self, request, pk):
+        post = RecruitmentPost.objects.filter(pk=pk).first()
+        if post is None:
+            raise ObjectDoesNotExist()
+
+        status = request.POST.get('status')
+        if status not in RecruitmentApplication.status_transitions:
+            raise BadRequest()
+        permitted = {action for action, users, url_name, name in self.status_actions
+                     if request.user in getattr(post, users)}
+        if status not in permitted:
+            raise PermissionDenied()
+
+        applications = RecruitmentApplication.objects.filter(recruitment_post=pk)
+        if request.POST.get('all') == 'true':
+            requested = None
+            applications = applications.filter(pk__in=self.get_queryset().order_by().values('pk'))
+        else:
+            requested = [int(application) for application in request.POST.getlist('applications') if application.isdigit()]
+            applications = applications.filter(pk__in=requested)
+
+        current = dict(applications.values_list('pk', 'status'))
+        updated = [application for application, application_status in current.items()
+                   if application_status in RecruitmentApplication.status_transitions[status]]
+        if updated:
+            RecruitmentApplication.objects.filter(pk__in=updated).transitionable(status).update(status=status)
+            RecruitmentApplication.objects.get_data_version(pk).invalidate()
+            stats.invalidate()
+            for application in updated:
+                current[application] = status
+
+        status_text = dict(RecruitmentApplication.status_choices)
+        updated = set(updated)
+        results = []
+        for application in (current if requested is None else requested):
+            if application not in current:
+                results.append({'id': application, 'result': 'not_found'})
+                continue
+            results.append({
+                'id': application,
+                'result': 'updated' if application in updated else 'unchanged',
+                'status': current[application],
+                'status_text': status_text[current[application]],
+                'actions': self.get_actions(application, current[application], permitted),
+            })
+
+        return JsonResponse({'status': status, 'updated': len(updated), 'results': results})
+
+
 class SkillAutocomplete(View):
     def get(self, request, pk, *args, **kwargs):
         query = request.GET.get('q')
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'querybudget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,6 +61,10 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'django.template.context_processors.request',
             ],
+            'libraries': {
+                'pagination': 'templatetags.pagination',
+                'permission_matrix': 'templatetags.permission_matrix',
+            },
         }
     },
 ]
@@ -95,6 +100,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+MEDIA_URL = 'media/'
+
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -115,3 +124,47 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 AUTH_USER_MODEL = 'user.User'
+
+# The local memory cache is private to each process, so signal based invalidation of cached
+# dashboard stats only reaches the worker that handled the write. Run a single worker with it,
+# deployments with several workers use the shared database cache from settings_postgresql.py.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+DASHBOARD_STATS_TIMEOUT = 300
+
+# Seconds a worker keeps settings loaded from the database before reading them again, changes saved
+# through another worker are picked up within this time
+SETTINGS_REGISTRY_TIMEOUT = 5
+
+# Same for the report card templates loaded by SemesterReportCardTemplate.objects
+REPORT_CARD_TEMPLATES_TIMEOUT = 30
+
+APPLICANT_RANKING_TIMEOUT = 600
+
+# Seconds a running export job may go without reporting progress before it is failed as abandoned
+EXPORT_JOB_STALE_TIMEOUT = 600
+
+QUERY_BUDGET_ENABLED = True
+
+# Every request is recorded under DEBUG, otherwise only this fraction of them
+QUERY_BUDGET_SAMPLE_RATE = 0
+
+QUERY_BUDGET_RAISE = False
+
+QUERY_BUDGET_REPEAT_THRESHOLD = 5
+
+QUERY_BUDGET_DEFAULT = 50
+
+QUERY_BUDGETS = {
+    'recruitment_posts': 15,
+    'recruitment_applications': 25,
+    'academic_info': 25,
+    'user_list': 15,
+    # The CSV exports stream every row
+    'recruitment_applications_csv': None,
+    'user_csv': None,
+}
@@ -13,3 +13,13 @@ DATABASES = {
         'PORT': '5432',
     }
 }
+
+# Shared by every worker so cache invalidation reaches all of them, create it with
+# python manage.py createcachetable
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
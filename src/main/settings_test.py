@@ -0,0 +1,5 @@
+from .settings import *
+
+QUERY_BUDGET_SAMPLE_RATE = 1
+
+QUERY_BUDGET_RAISE = True
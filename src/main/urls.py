@@ -27,6 +27,7 @@ urlpatterns = [
     path('staff/', include('staff.urls')),
     path('recruiter/', include('recruiter.urls')),
     path('resume/', include('resume.urls')),
+    path('export/', include('management.urls')),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root = settings.MEDIA_ROOT)
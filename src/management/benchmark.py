@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from math import ceil
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+from querybudget import QueryRecorder
+from user.models import User
+from cell.models import RecruitmentPost
+from cell.views import RecruitmentApplications
+import django
+import json
+import time
+import tracemalloc
+
+
+@dataclass
+class Scenario:
+    name: str
+    url: str
+    user: User = None
+
+
+@dataclass
+class Thresholds:
+    latency: float = 1.25
+    latency_floor_ms: float = 5.0
+    queries: int = 0
+    memory: float = 1.5
+    memory_floor_kb: float = 256.0
+
+
+def get_actors():
+    post = RecruitmentPost.objects.filter(user__isnull=False).annotate(
+        applicant_count=Count('applications')).order_by('-applicant_count').first()
+    return {
+        'admin': User.objects.filter(is_approved=True).filter(is_superuser=True).first() or
+                 User.objects.filter(is_approved=True, is_coordinator=True).first(),
+        'staff': User.objects.filter(role='staff', is_approved=True, is_superuser=False, is_coordinator=False).first(),
+        'recruiter': post.user if post else None,
+        'student': User.objects.filter(role='student', is_approved=True, student_profile__is_current=True).first(),
+        'post': post,
+    }
+
+
+def get_scenarios(actors):
+    admin, staff, recruiter, student, post = (actors[name] for name in ['admin', 'staff', 'recruiter', 'student', 'post'])
+    scenarios = [Scenario('index', reverse('index'))]
+    for role in ['admin', 'staff', 'recruiter', 'student']:
+        if actors[role]:
+            scenarios.append(Scenario(f'dashboard[{role}]', reverse('dashboard'), actors[role]))
+
+    if student:
+        for name, query in [('all', ''), ('search', '?q=engineer'), ('company', '?company-filter=Acme'),
+                            ('location-type', '?location-filter=Pune&job-type-filters=FT'),
+                            ('skill-inactive', '?skill-filter=Python&is-active-filter=false'),
+                            ('apply-by-desc', '?sorting=apply_by&ordering=desc')]:
+            scenarios.append(Scenario(f'recruitment_posts[{name}]', reverse('recruitment_posts') + query, student))
+        scenarios.append(Scenario('academic_info', reverse('academic_info', args=[student.student_profile.pk]), student))
+        scenarios.append(Scenario('skill_autocomplete', reverse('skill_autocomplete') + f'?q=py&u={student.pk}', student))
+
+    if post and recruiter:
+        url = reverse('recruitment_applications', args=[post.pk])
+        for sorting, name in RecruitmentApplications.sorting_options + [('rank', 'Rank Score')]:
+            scenarios.append(Scenario(f'recruitment_applications[{sorting}]', f'{url}?sorting={sorting}', recruiter))
+        scenarios.append(Scenario('recruitment_post_skill_autocomplete',
+                                  reverse('recruitment_post_skill_autocomplete', args=[post.pk]) + '?q=py', recruiter))
+        if student:
+            scenarios.append(Scenario('resume', reverse('resume', args=[student.pk]), recruiter))
+
+    if admin:
+        scenarios.append(Scenario('user_list[all]', reverse('user_list'), admin))
+        scenarios.append(Scenario('user_list[student]', reverse('user_list') + '?role-filter=student', admin))
+        scenarios.append(Scenario('user_csv', reverse('user_csv') + '?role-filter=student', admin))
+        scenarios.append(Scenario('user_list_skill_autocomplete', reverse('user_list_skill_autocomplete') + '?q=py', admin))
+    return scenarios
+
+
+def fetch(client, url):
+    response = client.get(url)
+    if response.streaming:
+        for chunk in response.streaming_content:
+            pass
+    else:
+        response.content
+    return response.status_code
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+def measure(scenario, iterations, warmup):
+    client = Client(raise_request_exception=False)
+    if scenario.user:
+        client.force_login(scenario.user)
+    for _ in range(warmup):
+        fetch(client, scenario.url)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        status = fetch(client, scenario.url)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    queries = QueryRecorder()
+    with queries.record():
+        fetch(client, scenario.url)
+
+    tracemalloc.start()
+    try:
+        fetch(client, scenario.url)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'status': status,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'queries': queries.count,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run(iterations=20, warmup=2, only=None, log=None):
+    scenarios = get_scenarios(get_actors())
+    if only:
+        scenarios = [scenario for scenario in scenarios if any(name in scenario.name for name in only)]
+
+    results = {}
+    with override_settings(ALLOWED_HOSTS=['*'], QUERY_BUDGET_RAISE=False):
+        for scenario in scenarios:
+            results[scenario.name] = measure(scenario, iterations, warmup)
+            if log:
+                log(scenario.name, results[scenario.name])
+    return {
+        'environment': {'database': connection.vendor, 'django': django.get_version(), 'iterations': iterations},
+        'results': results,
+    }
+
+
+def compare(report, baseline, thresholds=Thresholds()):
+    regressions = []
+    for name, result in report['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        if result['status'] != previous['status']:
+            regressions.append(f'{name}: status {previous["status"]} -> {result["status"]}')
+        if result['queries'] > previous['queries'] + thresholds.queries:
+            regressions.append(f'{name}: {previous["queries"]} -> {result["queries"]} queries')
+        if (result['p95_ms'] > previous['p95_ms'] * thresholds.latency and
+                result['p95_ms'] - previous['p95_ms'] > thresholds.latency_floor_ms):
+            regressions.append(f'{name}: p95 {previous["p95_ms"]}ms -> {result["p95_ms"]}ms')
+        if (result['peak_memory_kb'] > previous['peak_memory_kb'] * thresholds.memory and
+                result['peak_memory_kb'] - previous['peak_memory_kb'] > thresholds.memory_floor_kb):
+            regressions.append(f'{name}: peak memory {previous["peak_memory_kb"]}KB -> {result["peak_memory_kb"]}KB')
+    return regressions
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def save(report, path):
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+
+
+def assert_no_regressions(baseline_path, thresholds=Thresholds(), **options):
+    regressions = compare(run(**options), load(baseline_path), thresholds)
+    assert not regressions, 'Benchmark regressions:\n' + '\n'.join(regressions)
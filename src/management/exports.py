@@ -0,0 +1,74 @@
+from hashlib import sha256
+from django.core.files import File
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from cell.views import RecruitmentApplicationsCSV
+from user.views import UserCSVView
+from .models import ExportJob
+import json
+import tempfile
+
+
+exporters = {
+    'applications': RecruitmentApplicationsCSV,
+    'students': UserCSVView,
+}
+
+
+def get_key(kind, arguments, params, base_url, stamp):
+    data = json.dumps([kind, arguments, params, base_url, stamp], sort_keys=True)
+    return sha256(data.encode()).hexdigest()
+
+
+def get_view(kind, request, arguments, base_url=None):
+    view = exporters[kind]()
+    view.setup(request, **arguments)
+    view.base_url = base_url
+    return view
+
+
+def get_job_view(job):
+    request = HttpRequest()
+    request.method = 'GET'
+    request.user = job.user
+    request.GET = QueryDict(mutable=True)
+    for key, values in job.params.items():
+        request.GET.setlist(key, values)
+    return get_view(job.kind, request, job.arguments, job.base_url)
+
+
+def request_export(request, kind, arguments):
+    view = get_view(kind, request, arguments)
+    params = view.get_export_params()
+    base_url = request.build_absolute_uri('/')
+    key = get_key(kind, arguments, params, base_url, view.get_export_stamp())
+
+    ExportJob.objects.fail_stale()
+    job = ExportJob.objects.reusable(key).first()
+    if job is not None and (job.status != 'D' or job.has_artifact):
+        return job
+    return ExportJob.objects.create(user=request.user, kind=kind, arguments=arguments, params=params,
+                                    base_url=base_url, key=key)
+
+
+def run(job):
+    view = get_job_view(job)
+    queryset = view.get_queryset()
+    job.total = queryset.count()
+    job.processed = 0
+    job.save(update_fields=['total', 'processed', 'updated_on'])
+
+    processed = 0
+    with tempfile.TemporaryFile() as file:
+        for processed, line in enumerate(view.get_csv_rows(queryset)):
+            file.write(line.encode())
+            if processed and processed % view.csv_chunk_size == 0:
+                ExportJob.objects.filter(pk=job.pk).update(processed=processed, updated_on=timezone.now())
+        file.seek(0)
+        job.file.save(f'{job.key}.csv', File(file), save=False)
+
+    job.processed = processed
+    job.status = 'D'
+    job.finished_on = timezone.now()
+    job.save()
+    return job
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from student.models import SemesterReportCard
+
+
+class Command(BaseCommand):
+    help = 'Number the semester report cards of every student that has unnumbered cards, in creation order'
+
+    def handle(self, *args, **kwargs):
+        count = SemesterReportCard.objects.number_cards()
+        self.stdout.write(self.style.SUCCESS(f'Successfully numbered {count} semester report cards'))
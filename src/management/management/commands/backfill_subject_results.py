@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from student.models import SemesterReportCard, SubjectResult
+
+
+class Command(BaseCommand):
+    help = 'Build the subject result rows of semester report cards from their subject lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rebuild the rows of every card, not only the cards without any')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **kwargs):
+        cards = SemesterReportCard.objects.order_by('pk')
+        if not kwargs['all']:
+            cards = cards.filter(subject_results__isnull=True)
+        cards = cards.only('subjects', 'subject_codes', 'subject_credits', 'subject_letter_grades',
+                           'subject_grade_points', 'subject_passing_grade_points')
+
+        card_count = result_count = 0
+        last_pk = 0
+        while True:
+            batch = list(cards.filter(pk__gt=last_pk)[:kwargs['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            results = [result for card in batch for result in card.get_subject_results()]
+            with transaction.atomic():
+                SubjectResult.objects.filter(report_card__in=batch).delete()
+                SubjectResult.objects.bulk_create(results)
+            card_count += len(batch)
+            result_count += len(results)
+        self.stdout.write(self.style.SUCCESS(f'Successfully stored {result_count} subject results for {card_count} cards'))
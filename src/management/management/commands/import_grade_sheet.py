@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from student.models import StudentProfile
+from student.gradesheets import GradeSheetError, import_grade_sheet
+from cell import stats
+
+
+class Command(BaseCommand):
+    help = 'Import the semester results of a whole batch from a CSV or XLSX grade sheet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX grade sheet')
+        parser.add_argument('--course', required=True, choices=[course for course, name in StudentProfile.course_choices])
+        parser.add_argument('--semester', required=True, type=int)
+        parser.add_argument('--year-of-exam', type=int, help='Used for rows without a year_of_exam value')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the sheet without saving anything')
+
+    def handle(self, *args, **kwargs):
+        try:
+            with open(kwargs['path'], 'rb') as file:
+                report = import_grade_sheet(file, kwargs['path'], kwargs['course'], kwargs['semester'],
+                                            year_of_exam=kwargs['year_of_exam'], dry_run=kwargs['dry_run'])
+        except (GradeSheetError, OSError) as error:
+            raise CommandError(error)
+
+        for error in report.errors:
+            self.stderr.write(f'Row {error.row} ({error.registration_number}): {error.message}')
+        summary = (f'{report.rows} rows, {report.created} cards created, {report.updated} updated, '
+                   f'{report.unchanged} unchanged, {report.placeholders} earlier semester cards added, '
+                   f'{len(report.errors)} errors')
+        if report.dry_run:
+            self.stdout.write(f'Dry run: {summary}')
+        else:
+            stats.invalidate()
+            self.stdout.write(self.style.SUCCESS(
+                f'Successfully imported {summary}, {report.recomputed} student profiles recomputed'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.core.management import CommandError
+from django.db import connection, transaction
+from cell.models import RecruitmentPost
+from cell import search
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of recruitment posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **kwargs):
+        if connection.vendor not in search.backends:
+            raise CommandError(f'Full-text search is not supported on {connection.vendor}')
+
+        with transaction.atomic():
+            count = search.rebuild(RecruitmentPost.objects.all(), kwargs['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {count} recruitment posts'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from student.academics import recompute
+from student.models import StudentProfile
+from cell import stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the CGPA, backlogs, passed semesters and pass out year of student profiles from their report cards'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', action='append', choices=[course for course, _ in StudentProfile.course_choices],
+                            help='Only recompute students of this course, can be repeated')
+        parser.add_argument('--batch', type=int, action='append', metavar='REGISTRATION_YEAR',
+                            help='Only recompute students registered in this year, can be repeated')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without saving them')
+
+    def handle(self, *args, **kwargs):
+        profiles = StudentProfile.objects.all()
+        if kwargs['course']:
+            profiles = profiles.of_course(*kwargs['course'])
+        if kwargs['batch']:
+            profiles = profiles.filter(registration_year__in=kwargs['batch'])
+
+        report = recompute(profiles, kwargs['batch_size'], kwargs['dry_run'])
+        if report.changed and not report.dry_run:
+            stats.invalidate()
+
+        for name, count in sorted(report.fields.items()):
+            self.stdout.write(f'  {name}: {count}')
+        action = 'Would update' if report.dry_run else 'Successfully updated'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {report.changed} of {report.profiles} student profiles in {report.seconds:.2f}s'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from cell.models import RecruitmentApplication
+
+class Command(BaseCommand):
+    help = 'Recompute the stored skill match counters of recruitment applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Recompute every application instead of only the ones that are out of date')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many applications are out of date')
+
+    def handle(self, *args, **kwargs):
+        applications = RecruitmentApplication.objects.all()
+        stale = applications.stale_skill_counts().values('pk')
+        if kwargs['dry_run']:
+            self.stdout.write(f'{stale.count()} applications have out of date skill counters')
+            return
+
+        if not kwargs['all']:
+            applications = applications.filter(pk__in=list(stale.values_list('pk', flat=True)))
+        count = applications.update_skill_counts()
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated skill counters of {count} applications'))
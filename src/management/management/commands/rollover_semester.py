@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from settings import registry
+from student.models import StudentProfile
+from cell import stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored year, semester and roll of every student profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--academic-half', choices=registry.definitions['current_academic_half'].choices,
+                            help='Switch the current academic half before recomputing')
+
+    def handle(self, *args, **kwargs):
+        current_academic_half = registry.get('current_academic_half')
+        academic_half = kwargs['academic_half'] or current_academic_half
+        with transaction.atomic():
+            count = StudentProfile.objects.update_academic_positions(academic_half)
+            if academic_half != current_academic_half:
+                # Saving the setting runs update_academic_positions again, it finds nothing left to change
+                registry.update('current_academic_half', academic_half)
+        stats.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully updated {count} student profiles for the {academic_half} academic half'))
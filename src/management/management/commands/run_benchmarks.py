@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.core.management import CommandError
+from management import benchmark
+import os
+
+class Command(BaseCommand):
+    help = 'Measure latency, query count and peak memory of the hot endpoints and compare them with a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--only', action='append', help='Only run scenarios whose name contains this text, can be repeated')
+        parser.add_argument('--output', help='Write the report to this JSON file')
+        parser.add_argument('--baseline', help='Compare the report with this JSON file')
+        parser.add_argument('--update-baseline', action='store_true', help='Overwrite the baseline with this report')
+        parser.add_argument('--latency-threshold', type=float, default=benchmark.Thresholds.latency,
+                            help='Allowed p95 latency ratio over the baseline')
+        parser.add_argument('--query-threshold', type=int, default=benchmark.Thresholds.queries,
+                            help='Allowed extra queries over the baseline')
+        parser.add_argument('--memory-threshold', type=float, default=benchmark.Thresholds.memory,
+                            help='Allowed peak memory ratio over the baseline')
+
+    def log(self, name, result):
+        self.stdout.write(f'{name:50} {result["status"]:>4} p50={result["p50_ms"]:>9.2f}ms p95={result["p95_ms"]:>9.2f}ms '
+                          f'queries={result["queries"]:>5} peak={result["peak_memory_kb"]:>10.1f}KB')
+
+    def handle(self, *args, **kwargs):
+        report = benchmark.run(kwargs['iterations'], kwargs['warmup'], kwargs['only'], self.log)
+        if not report['results']:
+            raise CommandError('No scenario could be built, seed the database first with seed_load')
+        if kwargs['output']:
+            benchmark.save(report, kwargs['output'])
+
+        baseline = kwargs['baseline']
+        if not baseline:
+            return
+        if kwargs['update_baseline'] or not os.path.exists(baseline):
+            benchmark.save(report, baseline)
+            self.stdout.write(self.style.SUCCESS(f'Saved the baseline to {baseline}'))
+            return
+
+        thresholds = benchmark.Thresholds(latency=kwargs['latency_threshold'], queries=kwargs['query_threshold'],
+                                          memory=kwargs['memory_threshold'])
+        regressions = benchmark.compare(report, benchmark.load(baseline), thresholds)
+        if regressions:
+            raise CommandError('Benchmark regressions:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline}'))
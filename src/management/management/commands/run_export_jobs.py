@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from management.models import ExportJob
+from management import exports
+import time
+import traceback
+
+class Command(BaseCommand):
+    help = 'Build the queued CSV export jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **kwargs):
+        while True:
+            ExportJob.objects.fail_stale()
+            job = ExportJob.objects.claim_next()
+            if job is None:
+                if kwargs['once']:
+                    break
+                time.sleep(kwargs['interval'])
+                continue
+
+            try:
+                exports.run(job)
+            except Exception as error:
+                ExportJob.objects.filter(pk=job.pk).update(status='F', error=str(error), finished_on=timezone.now())
+                self.stderr.write(traceback.format_exc())
+                self.stdout.write(self.style.ERROR(f'Failed {job}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'Successfully exported {job.processed} rows for {job}'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.core.management import CommandError
+from django.db import transaction
+from management.seed import Seeder
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic population of users, posts and applications for load testing'
+
+    populations = {
+        'students': 50000,
+        'staff': 100,
+        'recruiters': 2000,
+        'skills': 300,
+        'posts': 5000,
+        'applications': 500000,
+        'notices': 2000,
+        'updates': 10000,
+    }
+
+    def add_arguments(self, parser):
+        for name, count in self.populations.items():
+            parser.add_argument(f'--{name}', type=int, default=count)
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiply every population by this factor')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--password', default='password', help='Password of every generated user')
+
+    def handle(self, *args, **kwargs):
+        counts = {name: max(int(kwargs[name] * kwargs['scale']), 1) for name in self.populations}
+        seeder = Seeder(kwargs['seed'], kwargs['batch_size'], kwargs['password'], log=self.stdout.write)
+        if seeder.is_seeded():
+            raise CommandError(f'The database already contains data generated with seed {kwargs["seed"]}, use another --seed')
+
+        with transaction.atomic():
+            skills = seeder.create_skills(counts['skills'])
+            students = seeder.create_students(counts['students'], skills)
+            staff = seeder.create_staff(counts['staff'])
+            recruiters = seeder.create_recruiters(counts['recruiters'])
+            posts = seeder.create_posts(counts['posts'], recruiters, skills)
+            seeder.create_applications(counts['applications'], posts, students)
+            seeder.create_notices(counts['notices'], staff)
+            seeder.create_updates(counts['updates'], posts)
+            seeder.finish()
+        self.stdout.write(self.style.SUCCESS(f'Successfully seeded {sum(counts.values())} objects'))
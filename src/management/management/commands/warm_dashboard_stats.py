@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from cell.stats import DashboardStats
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Pre-compute and cache the dashboard statistics of approved users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help='Only warm the statistics of the user with this id, can be repeated')
+
+    def handle(self, *args, **kwargs):
+        users = User.objects.filter(is_approved=True)
+        if kwargs['users']:
+            users = users.filter(pk__in=kwargs['users'])
+
+        count = 0
+        for user in users.iterator():
+            DashboardStats.cached_for_user(user)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Successfully warmed dashboard statistics for {count} users'))
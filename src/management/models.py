@@ -1,3 +1,71 @@
+from django.conf import settings
 from django.db import models
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from datetime import timedelta
+from user.models import User
 
-# Create your models here.
+
+class ExportJob(models.Model):
+    class QuerySet(models.QuerySet):
+        def stale(self):
+            # Running jobs report progress every chunk, one that stopped reporting lost its worker
+            cutoff = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_TIMEOUT)
+            return self.filter(status='R', updated_on__lt=cutoff)
+
+        def fail_stale(self):
+            return self.stale().update(status='F', error='The export stopped without finishing.',
+                                       finished_on=timezone.now())
+
+        def reusable(self, key):
+            return self.filter(key=key).exclude(status='F').exclude(pk__in=self.stale()).order_by('-created_on')
+
+        def claim_next(self):
+            for pk in self.filter(status='Q').order_by('created_on').values_list('pk', flat=True)[:10]:
+                if self.filter(pk=pk, status='Q').update(status='R', updated_on=timezone.now()):
+                    return self.get(pk=pk)
+            return None
+
+    objects = models.Manager.from_queryset(QuerySet)()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['key', 'status']),
+            models.Index(fields=['status', 'created_on']),
+        ]
+
+    status_choices = [
+        ('Q', 'Queued'),
+        ('R', 'Running'),
+        ('D', 'Done'),
+        ('F', 'Failed'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    kind = models.CharField(max_length=50)
+    arguments = models.JSONField(default=dict)
+    params = models.JSONField(default=dict)
+    base_url = models.CharField(max_length=255)
+    key = models.CharField(max_length=64)
+    status = models.CharField(max_length=1, choices=status_choices, default='Q')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to='exports/', blank=True)
+    error = models.TextField(blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    updated_on = models.DateTimeField(auto_now=True)
+    finished_on = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def progress(self):
+        if self.status == 'D':
+            return 100
+        if not self.total:
+            return 0
+        return min(self.processed * 100 // self.total, 99)
+
+    @property
+    def has_artifact(self):
+        return self.status == 'D' and bool(self.file) and default_storage.exists(self.file.name)
+
+    def __str__(self):
+        return f'{self.kind} export {self.key[:12]} ({self.get_status_display()})'
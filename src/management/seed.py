@@ -0,0 +1,276 @@
+from datetime import datetime, timedelta
+from random import Random
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max, OuterRef, Subquery
+from settings import registry
+from user.models import User, Email
+from student.models import StudentProfile, SemesterReportCard, SemesterReportCardTemplate, SubjectResult
+from staff.models import StaffProfile
+from recruiter.models import RecruiterProfile
+from resume.models import Skill
+from cell.models import Notice, RecruitmentPost, RecruitmentPostUpdate, RecruitmentApplication
+from cell import search, stats
+
+
+first_names = ['Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Bhavna', 'Deepak', 'Diya', 'Farhan', 'Gaurav',
+               'Ishita', 'Karan', 'Kavya', 'Manish', 'Meera', 'Neha', 'Nikhil', 'Pooja', 'Rahul', 'Riya',
+               'Rohan', 'Sakshi', 'Sanjay', 'Sneha', 'Tanvi', 'Varun', 'Vikram', 'Zoya']
+last_names = ['Ahmed', 'Baruah', 'Bora', 'Chakraborty', 'Das', 'Deka', 'Dutta', 'Gogoi', 'Gupta', 'Hazarika',
+              'Kalita', 'Nath', 'Roy', 'Saikia', 'Sarma', 'Sharma', 'Singh', 'Talukdar']
+skill_names = ['Python', 'Django', 'Java', 'C', 'C++', 'JavaScript', 'TypeScript', 'React', 'Angular', 'Vue',
+               'Node.js', 'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'Azure',
+               'Linux', 'Git', 'Go', 'Rust', 'Kotlin', 'Swift', 'Flutter', 'Machine Learning', 'Deep Learning',
+               'Data Analysis', 'Pandas', 'NumPy', 'TensorFlow', 'PyTorch', 'Computer Vision', 'NLP', 'Spark',
+               'Hadoop', 'Tableau', 'Power BI', 'HTML', 'CSS', 'Figma', 'Networking', 'Cyber Security', 'VLSI',
+               'Embedded Systems', 'MATLAB', 'R', 'Excel']
+companies = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Cyberdyne',
+             'Soylent', 'Tyrell', 'Wonka', 'Oscorp', 'Vandelay', 'Massive Dynamic', 'Aperture']
+locations = ['Guwahati', 'Silchar', 'Bengaluru', 'Hyderabad', 'Pune', 'Delhi', 'Mumbai', 'Chennai', 'Kolkata', 'Remote']
+titles = ['Software Engineer', 'Backend Developer', 'Frontend Developer', 'Data Analyst', 'Data Scientist',
+          'DevOps Engineer', 'QA Engineer', 'Product Intern', 'Research Intern', 'Systems Engineer']
+grades = [('O', 10), ('A+', 9), ('A', 8), ('B+', 7), ('B', 6), ('C', 5), ('F', 0)]
+grade_weights = [8, 16, 24, 22, 15, 10, 5]
+courses = [('B.Tech', 4, 75), ('M.Tech', 2, 20), ('PhD', 6, 5)]
+
+
+def batched(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def insert_rows(model, fields, rows):
+    quote = connection.ops.quote_name
+    columns = [quote(model._meta.get_field(field).column) for field in fields]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {quote(model._meta.db_table)} ({", ".join(columns)}) VALUES ({", ".join(["%s"] * len(columns))})',
+            rows)
+
+
+class Seeder:
+    def __init__(self, seed=0, batch_size=2000, password='password', log=None):
+        self.random = Random(seed)
+        self.seed = seed
+        self.batch_size = batch_size
+        self.password = make_password(password)
+        self.log = log or (lambda message: None)
+        self.year = datetime.now().year
+        self.templates = SemesterReportCardTemplate.objects.get_templates()
+        self.registration_serials = {}
+
+    def email(self, role, index):
+        return f'seed{self.seed}-{role}-{index}@load.test'
+
+    def is_seeded(self):
+        return Email.objects.filter(email__startswith=f'seed{self.seed}-').exists()
+
+    def create_users(self, role, count, approved=1.0):
+        user_ids = []
+        for batch in batched(range(count), self.batch_size):
+            with transaction.atomic():
+                emails = Email.objects.bulk_create([Email(email=self.email(role, index), is_verified=True)
+                                                    for index in batch])
+                users = []
+                for email in emails:
+                    first_name, last_name = self.random.choice(first_names), self.random.choice(last_names)
+                    users.append(User(
+                        first_name=first_name, last_name=last_name, full_name=f'{first_name} {last_name}',
+                        short_name=first_name, role=role, primary_email=email, password=self.password,
+                        is_approved=self.random.random() < approved,
+                    ))
+                users = User.objects.bulk_create(users)
+                Email.objects.filter(pk__in=[email.pk for email in emails]).update(
+                    user=Subquery(User.objects.filter(primary_email=OuterRef('pk')).values('pk')[:1]))
+            user_ids.extend(user.pk for user in users)
+        self.log(f'Created {len(user_ids)} {role} users')
+        return user_ids
+
+    def create_skills(self, count):
+        names = skill_names + [f'Skill {index}' for index in range(max(count - len(skill_names), 0))]
+        Skill.objects.bulk_create([Skill(name=name) for name in names[:count]], ignore_conflicts=True)
+        return list(Skill.objects.filter(name__in=names[:count]).values_list('pk', flat=True))
+
+    def get_report_card(self, course, semester, year_of_exam, complete):
+        template = self.templates.get((course, semester))
+        card = SemesterReportCard(semester_number=semester, year_of_exam=year_of_exam, is_complete=complete)
+        if template is None:
+            return card
+        card.subjects = template.subjects
+        card.subject_codes = template.subject_codes
+        card.subject_credits = template.subject_credits
+        card.subject_passing_grade_points = template.subject_passing_grade_points
+        card.total_credits = round(sum(float(credit) for credit in template.subject_credits), 1)
+        if not complete:
+            card.subject_letter_grades = ['S' for _ in template.subjects]
+            card.subject_grade_points = [0 for _ in template.subjects]
+            return card
+
+        letters = self.random.choices(grades, grade_weights, k=len(template.subjects))
+        card.subject_letter_grades = [letter for letter, points in letters]
+        card.subject_grade_points = [points for letter, points in letters]
+        card.backlogs = card.subject_letter_grades.count('F')
+        card.passed = card.backlogs == 0
+        card.earned_credits = round(sum(float(credit) * points / 10
+                                        for credit, points in zip(template.subject_credits, card.subject_grade_points)), 2)
+        weighted = sum(float(credit) * float(passing if letter == 'F' else points) for credit, points, passing, letter in zip(
+            template.subject_credits, card.subject_grade_points, template.subject_passing_grade_points,
+            card.subject_letter_grades))
+        card.sgpa = round(weighted / card.total_credits, 2) if card.total_credits else 0
+        return card
+
+    def next_registration_number(self, registration_year):
+        first = registration_year * 10 ** 7
+        if registration_year not in self.registration_serials:
+            last = StudentProfile.objects.filter(registration_number__range=(first, first + 10 ** 7 - 1)).aggregate(
+                last=Max('registration_number'))['last']
+            self.registration_serials[registration_year] = last - first if last else 0
+        self.registration_serials[registration_year] += 1
+        return first + self.registration_serials[registration_year]
+
+    def get_student(self, user_id, index, odd_half):
+        course, duration = self.random.choices([(name, years) for name, years, weight in courses],
+                                               [weight for name, years, weight in courses])[0]
+        alumni = self.random.random() < 0.15
+        if alumni:
+            registration_year = self.year - duration - self.random.randint(0, 3)
+            semesters = duration * 2
+        else:
+            registration_year = self.year - self.random.randint(1, duration)
+            year = min(self.year - registration_year, duration)
+            semesters = year * 2 - 1 if odd_half else year * 2
+
+        cards = [self.get_report_card(course, semester, min(registration_year + (semester + 1) // 2, self.year),
+                                      alumni or semester < semesters)
+                 for semester in range(1, semesters + 1)]
+        complete = [card for card in cards if card.is_complete]
+        total_credits = sum(card.total_credits for card in complete)
+        passed_semesters = sum(1 for card in cards if card.passed)
+
+        profile = StudentProfile(
+            user_id=user_id, course=course, course_duration=duration,
+            registration_number=self.next_registration_number(registration_year),
+            registration_year=registration_year,
+            number=1000000000 + index,
+            id_number=index % 999 + 1,
+            id_card=f'{registration_year % 100}CSE{"BTC" if course == "B.Tech" else "MTC" if course == "M.Tech" else "PHD"}{index % 999 + 1:03d}',
+            cgpa=sum(card.sgpa * card.total_credits for card in complete) / total_credits if total_credits else 0,
+            backlog_count=sum(card.backlogs for card in cards),
+            passed_semesters=passed_semesters,
+            passed_out=passed_semesters >= duration * 2,
+            is_current=passed_semesters < duration * 2,
+        )
+        if profile.passed_out:
+            profile.pass_out_year = max(card.year_of_exam for card in cards)
+        return profile, cards
+
+    def create_students(self, count, skills):
+        odd_half = registry.get('current_academic_half') == 'odd'
+        user_ids = self.create_users('student', count, approved=0.9)
+
+        card_count = 0
+        for offset, batch in enumerate(batched(user_ids, self.batch_size)):
+            with transaction.atomic():
+                students = [self.get_student(user_id, offset * self.batch_size + index, odd_half)
+                            for index, user_id in enumerate(batch)]
+                profiles = StudentProfile.objects.bulk_create([profile for profile, cards in students])
+                cards = []
+                for profile, (unsaved, profile_cards) in zip(profiles, students):
+                    for card in profile_cards:
+                        card.student_profile_id = profile.pk
+                        cards.append(card)
+                SemesterReportCard.objects.bulk_create(cards, batch_size=self.batch_size)
+                SubjectResult.objects.bulk_create([result for card in cards for result in card.get_subject_results()],
+                                                  batch_size=self.batch_size)
+                card_count += len(cards)
+
+                Skill.users.through.objects.bulk_create([
+                    Skill.users.through(user_id=user_id, skill_id=skill_id)
+                    for user_id in batch for skill_id in self.random.sample(skills, min(len(skills), self.random.randint(2, 12)))
+                ], batch_size=self.batch_size)
+        self.log(f'Created {len(user_ids)} student profiles with {card_count} semester report cards')
+        return user_ids
+
+    def create_staff(self, count):
+        user_ids = self.create_users('staff', count)
+        User.objects.filter(pk=user_ids[0]).update(is_coordinator=True)
+        StaffProfile.objects.bulk_create([StaffProfile(user_id=user_id) for user_id in user_ids],
+                                         batch_size=self.batch_size)
+        return user_ids
+
+    def create_recruiters(self, count):
+        user_ids = self.create_users('recruiter', count)
+        RecruiterProfile.objects.bulk_create([
+            RecruiterProfile(user_id=user_id, company_name=self.random.choice(companies), designation='HR')
+            for user_id in user_ids
+        ], batch_size=self.batch_size)
+        return user_ids
+
+    def create_posts(self, count, recruiters, skills):
+        today = datetime.now().date()
+        post_ids = []
+        for batch in batched(range(count), self.batch_size):
+            with transaction.atomic():
+                posts = RecruitmentPost.objects.bulk_create([
+                    RecruitmentPost(
+                        user_id=self.random.choice(recruiters), title=self.random.choice(titles),
+                        company=self.random.choice(companies), location=self.random.choice(locations),
+                        minimum_salary=self.random.randint(3, 10) * 100000,
+                        maximum_salary=self.random.randint(10, 30) * 100000,
+                        experience_duration=self.random.randint(0, 3),
+                        description=f'Seeded recruitment post {index}',
+                        apply_by=today + timedelta(days=self.random.randint(-180, 60)),
+                    ) for index in batch
+                ])
+                RecruitmentPost.skills.through.objects.bulk_create([
+                    RecruitmentPost.skills.through(recruitmentpost_id=post.pk, skill_id=skill_id)
+                    for post in posts for skill_id in self.random.sample(skills, min(len(skills), self.random.randint(2, 6)))
+                ])
+            post_ids.extend(post.pk for post in posts)
+        self.log(f'Created {len(post_ids)} recruitment posts')
+        return post_ids
+
+    def create_applications(self, count, posts, students):
+        applicants = list(User.objects.filter(pk__in=students, is_approved=True).values_list('pk', flat=True))
+        per_post = min(count // max(len(posts), 1), len(applicants))
+        statuses = [status for status, name in RecruitmentApplication.status_choices]
+        created = 0
+        for batch in batched(posts, max(self.batch_size // max(per_post, 1), 1)):
+            with transaction.atomic():
+                RecruitmentApplication.objects.bulk_create([
+                    RecruitmentApplication(user_id=user_id, recruitment_post_id=post_id, cover_letter='Seeded application',
+                                           status=self.random.choices(statuses, [60, 20, 5, 15])[0])
+                    for post_id in batch for user_id in self.random.sample(applicants, per_post)
+                ], batch_size=self.batch_size)
+                RecruitmentApplication.objects.filter(recruitment_post_id__in=batch).update_skill_counts()
+            created += per_post * len(batch)
+        self.log(f'Created {created} recruitment applications')
+        return created
+
+    def create_notices(self, count, staff):
+        Notice.objects.bulk_create([
+            Notice(title=f'Notice {index}', description=f'Seeded notice {index}', user_id=self.random.choice(staff))
+            for index in range(count)
+        ], batch_size=self.batch_size)
+        self.log(f'Created {count} notices')
+
+    def create_updates(self, count, posts):
+        owners = dict(RecruitmentPost.objects.filter(pk__in=posts).values_list('pk', 'user_id'))
+        for batch in batched(range(count), self.batch_size):
+            with transaction.atomic():
+                post_ids = [self.random.choice(posts) for index in batch]
+                notices = Notice.objects.bulk_create([
+                    Notice(kind='U', title=f'Update {index}', description=f'Seeded update {index}',
+                           user_id=owners[post_id])
+                    for index, post_id in zip(batch, post_ids)
+                ])
+                insert_rows(RecruitmentPostUpdate, ['notice_ptr', 'recruitment_post'],
+                            [(notice.pk, post_id) for notice, post_id in zip(notices, post_ids)])
+        self.log(f'Created {count} recruitment post updates')
+
+    def finish(self):
+        StudentProfile.objects.update_academic_positions()
+        if connection.vendor in search.backends:
+            search.rebuild(RecruitmentPost.objects.all(), self.batch_size)
+        transaction.on_commit(stats.invalidate)
+        transaction.on_commit(StudentProfile.objects.data_version.invalidate)
@@ -1,3 +1,89 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory
+from django.utils import timezone
+from cell.models import RecruitmentPost
+from student.models import StudentProfile
+from querybudget import get_budget
+from testing import create_user
+from .models import ExportJob
+from . import benchmark, exports
+import io
+import os
+import tempfile
 
-# Create your tests here.
+
+class ExportJobTest(TestCase):
+    def setUp(self):
+        self.admin = create_user('admin', 'staff', is_superuser=True)
+        user = create_user('student', 'student')
+        self.profile = StudentProfile.objects.create(user=user, registration_number=20210000001, course='B.Tech',
+                                                     number=1000000001, id_number=1)
+
+    def request_export(self):
+        request = RequestFactory().get('/user/list/csv/', {'role-filter': 'student'})
+        request.user = self.admin
+        return exports.request_export(request, 'students', {})
+
+    def test_export_is_reused_until_student_data_changes(self):
+        job = self.request_export()
+        self.admin.save(update_fields=['last_login'])
+        RecruitmentPost.objects.create(user=self.admin, title='Developer', company='Acme', description='Build things')
+        self.assertEqual(self.request_export(), job)
+
+        self.profile.cgpa = 9
+        self.profile.save()
+        self.assertNotEqual(self.request_export(), job)
+
+    def test_stale_running_job_is_failed_and_not_reused(self):
+        job = self.request_export()
+        ExportJob.objects.filter(pk=job.pk).update(status='R', updated_on=timezone.now() - timedelta(hours=1))
+        self.assertFalse(ExportJob.objects.reusable(job.key).exists())
+
+        new_job = self.request_export()
+        self.assertNotEqual(new_job, job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'F')
+
+    def test_running_job_that_reports_progress_is_reused(self):
+        job = self.request_export()
+        ExportJob.objects.filter(pk=job.pk).update(status='R', updated_on=timezone.now())
+        self.assertEqual(self.request_export(), job)
+
+
+class BenchmarkTest(TestCase):
+    populations = ['--students', '40', '--staff', '2', '--recruiters', '3', '--skills', '20', '--posts', '6',
+                   '--applications', '80', '--notices', '4', '--updates', '6']
+    # Timings and memory vary between machines, only the query counts are compared with the baseline
+    thresholds = benchmark.Thresholds(latency=float('inf'), memory=float('inf'))
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_load', *cls.populations, stdout=io.StringIO())
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = os.path.join(directory.name, 'baseline.json')
+
+    def test_endpoints_stay_within_their_query_budgets(self):
+        report = benchmark.run(iterations=1, warmup=0)
+        self.assertGreater(len(report['results']), 20)
+        for name, result in report['results'].items():
+            with self.subTest(name):
+                self.assertEqual(result['status'], 200)
+                budget = get_budget(name.split('[')[0])
+                if budget is not None:
+                    self.assertLessEqual(result['queries'], budget)
+
+    def test_assert_no_regressions_against_a_baseline(self):
+        options = {'iterations': 1, 'warmup': 0, 'only': ['recruitment_applications[applied_on]', 'user_list[student]']}
+        report = benchmark.run(**options)
+        benchmark.save(report, self.baseline)
+        benchmark.assert_no_regressions(self.baseline, self.thresholds, **options)
+
+        for result in report['results'].values():
+            result['queries'] -= 1
+        benchmark.save(report, self.baseline)
+        with self.assertRaisesMessage(AssertionError, 'Benchmark regressions'):
+            benchmark.assert_no_regressions(self.baseline, self.thresholds, **options)
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('applications/<int:pk>/', CreateExportJob.as_view(), {'kind': 'applications'}, name='export_applications'),
+    path('students/', CreateExportJob.as_view(), {'kind': 'students'}, name='export_students'),
+    path('<int:pk>/', ExportJobStatus.as_view(), name='export_status'),
+    path('<int:pk>/download/', DownloadExportJob.as_view(), name='export_download'),
+]
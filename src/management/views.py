@@ -1,3 +1,57 @@
-from django.shortcuts import render
+from django.shortcuts import reverse
+from django.contrib.auth.decorators import login_required
+from django.utils.decorators import method_decorator
+from django.core.exceptions import PermissionDenied, ObjectDoesNotExist
+from django.http import JsonResponse, FileResponse
+from django.views import View
+from .models import ExportJob
+from . import exports
 
-# Create your views here.
+
+def get_job_state(job):
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'status_text': job.get_status_display(),
+        'progress': job.progress,
+        'processed': job.processed,
+        'total': job.total,
+        'error': job.error,
+        'status_url': reverse('export_status', args=[job.pk]),
+        'download_url': reverse('export_download', args=[job.pk]) if job.status == 'D' else None,
+    }
+
+
+class ExportJobView(View):
+    def get_job(self, request, pk):
+        ExportJob.objects.filter(pk=pk).fail_stale()
+        job = ExportJob.objects.get(pk=pk)
+        if not exports.exporters[job.kind].has_export_permission(request.user, **job.arguments):
+            raise PermissionDenied()
+        return job
+
+
+@method_decorator(login_required, name="dispatch")
+class CreateExportJob(View):
+    def post(self, request, kind, **kwargs):
+        if kind not in exports.exporters:
+            raise ObjectDoesNotExist()
+        if not exports.exporters[kind].has_export_permission(request.user, **kwargs):
+            raise PermissionDenied()
+        return JsonResponse(get_job_state(exports.request_export(request, kind, kwargs)))
+
+
+@method_decorator(login_required, name="dispatch")
+class ExportJobStatus(ExportJobView):
+    def get(self, request, pk):
+        return JsonResponse(get_job_state(self.get_job(request, pk)))
+
+
+@method_decorator(login_required, name="dispatch")
+class DownloadExportJob(ExportJobView):
+    def get(self, request, pk):
+        job = self.get_job(request, pk)
+        if not job.has_artifact:
+            raise ObjectDoesNotExist()
+        return FileResponse(job.file.open('rb'), as_attachment=True,
+                            filename=exports.exporters[job.kind].csv_filename, content_type='text/csv')
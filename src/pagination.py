@@ -0,0 +1,112 @@
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from hashlib import md5
+from django.core.cache import cache
+from django.db.models import Q
+import json
+
+
+def encode_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def get_signature(ordering):
+    return ','.join(('-' if descending else '') + name for name, descending in ordering)
+
+
+def encode_cursor(ordering, values, backwards=False):
+    data = json.dumps({'o': get_signature(ordering), 'v': values, 'b': backwards}, default=encode_value,
+                      separators=(',', ':'))
+    return urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering):
+    try:
+        data = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        signature, values, backwards = data['o'], data['v'], bool(data['b'])
+    except (ValueError, TypeError, KeyError):
+        return None, False
+    if signature != get_signature(ordering) or not isinstance(values, list) or len(values) != len(ordering):
+        return None, False
+    return values, backwards
+
+
+def get_ordering(queryset, allowed_fields):
+    ordering = []
+    for field in queryset.query.order_by:
+        if not isinstance(field, str):
+            return None
+        descending = field.startswith('-')
+        if not queryset.query.standard_ordering:
+            descending = not descending
+        name = field.lstrip('-')
+        if name not in allowed_fields:
+            return None
+        ordering.append((name, descending))
+    ordering.append(('pk', ordering[-1][1] if ordering else False))
+    return ordering
+
+
+def get_key(obj, ordering):
+    values = []
+    for name, descending in ordering:
+        value = obj
+        for attribute in name.split('__'):
+            value = getattr(value, attribute)
+        values.append(value)
+    return values
+
+
+def seek(ordering, values, backwards):
+    query = Q()
+    equal = Q()
+    for (name, descending), value in zip(ordering, values):
+        lookup = 'lt' if descending != backwards else 'gt'
+        query |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return query
+
+
+def cached_count(queryset, timeout):
+    key = 'list-count:' + md5(str(queryset.query).encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+class CursorPage:
+    def __init__(self, queryset, ordering, per_page, cursor=None, count_timeout=60):
+        values, backwards = decode_cursor(cursor, ordering) if cursor else (None, False)
+        self.queryset = queryset.order_by()
+        self.count_timeout = count_timeout
+        flip = not queryset.query.standard_ordering
+        page = queryset.order_by(*[('-' if descending != flip else '') + name for name, descending in ordering])
+        if values is not None:
+            page = page.filter(seek(ordering, values, backwards))
+        if backwards:
+            page = page.reverse()
+
+        rows = list(page[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+
+        self.object_list = rows
+        self.has_next = has_more if not backwards else True
+        self.has_previous = values is not None and (has_more if backwards else True)
+        self.next_cursor = encode_cursor(ordering, get_key(rows[-1], ordering)) if rows and self.has_next else None
+        self.previous_cursor = encode_cursor(ordering, get_key(rows[0], ordering), True) if rows and self.has_previous else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def count(self):
+        return cached_count(self.queryset, self.count_timeout)
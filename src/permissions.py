@@ -0,0 +1,353 @@
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
+
+
+rules = {}
+
+
+def rule(label, *actions):
+    def register(predicate):
+        for action in actions:
+            rules[(label, action)] = predicate
+        return predicate
+    return register
+
+
+def get_rule(obj, action):
+    for klass in type(obj).__mro__:
+        meta = getattr(klass, '_meta', None)
+        if meta is not None and (meta.label, action) in rules:
+            return rules[(meta.label, action)]
+    raise ImproperlyConfigured(
+        f'No permission rule for {action!r} on {type(obj).__name__}')
+
+
+def can(actor, action, obj):
+    if actor is None or not actor.is_authenticated:
+        return False
+    return bool(get_rule(obj, action)(actor, obj))
+
+
+class Permitted:
+    def __init__(self, action, obj):
+        self.action = action
+        self.obj = obj
+
+    def __contains__(self, actor):
+        return can(actor, self.action, self.obj)
+
+
+class PermissionMatrix:
+    def __init__(self, actor, objects, actions):
+        self.rows = {
+            obj.pk: frozenset(action for action in actions if can(actor, action, obj))
+            for obj in objects
+        }
+
+    def actions_for(self, obj):
+        return self.rows.get(getattr(obj, 'pk', obj), frozenset())
+
+
+def profile(user, name):
+    if user is None:
+        return None
+    try:
+        return getattr(user, name)
+    except ObjectDoesNotExist:
+        return None
+
+
+def is_manager(actor):
+    return actor.is_superuser or actor.is_coordinator
+
+
+def is_self(actor, user_id):
+    return user_id is not None and actor.pk == user_id
+
+
+def owner_or_superuser(actor, owner_id, get_owner):
+    if is_self(actor, owner_id):
+        return True
+    if not actor.is_superuser or owner_id is None:
+        return False
+    return not get_owner().is_superuser
+
+
+def email_verified(user):
+    return user.primary_email_id is not None and user.primary_email.is_verified
+
+
+# User
+
+
+@rule('user.User', 'reset_password')
+def user_reset_password(actor, user):
+    return is_self(actor, user.pk)
+
+
+@rule('user.User', 'set_password')
+def user_set_password(actor, user):
+    if user.is_superuser:
+        return is_self(actor, user.pk)
+    return actor.is_superuser
+
+
+@rule('user.User', 'edit')
+def user_edit(actor, user):
+    return owner_or_superuser(actor, user.pk, lambda: user)
+
+
+@rule('user.User', 'view')
+def user_view(actor, user):
+    student_profile = profile(user, 'student_profile') if user.role == 'student' else None
+    if user.is_superuser or user.is_coordinator or user.role in ['staff', 'recruiter'] or (student_profile and student_profile.is_cr):
+        return True
+    if student_profile is None:
+        return False
+    if is_manager(actor) or is_self(actor, user.pk):
+        return True
+    actor_profile = profile(actor, 'student_profile')
+    if actor_profile and actor_profile.is_cr and actor_profile.course == student_profile.course:
+        if actor_profile.registration_year == student_profile.registration_year:
+            return True
+        if student_profile.pass_out_year is not None and actor_profile.pass_out_year == student_profile.pass_out_year:
+            return True
+    return user.job_applications.filter(recruitment_post__user=actor).exists()
+
+
+@rule('user.User', 'approve')
+def user_approve(actor, user):
+    if user.is_approved or not email_verified(user):
+        return False
+    return is_manager(actor)
+
+
+@rule('user.User', 'delete')
+def user_delete(actor, user):
+    if user.is_approved:
+        return False
+    return is_manager(actor)
+
+
+@rule('user.User', 'make_superuser')
+def user_make_superuser(actor, user):
+    if user.is_superuser or not email_verified(user):
+        return False
+    return actor.is_superuser
+
+
+@rule('user.User', 'make_coordinator')
+def user_make_coordinator(actor, user):
+    if user.is_coordinator or not email_verified(user):
+        return False
+    return is_manager(actor)
+
+
+@rule('user.User', 'remove_coordinator')
+def user_remove_coordinator(actor, user):
+    if user.is_superuser or not user.is_coordinator:
+        return False
+    return actor.is_superuser
+
+
+@rule('user.User', 'make_quoter')
+def user_make_quoter(actor, user):
+    if user.is_quoter or not user.is_approved:
+        return False
+    return actor.is_superuser
+
+
+@rule('user.User', 'remove_quoter')
+def user_remove_quoter(actor, user):
+    if not user.is_quoter:
+        return False
+    return actor.is_superuser
+
+
+@rule('user.User', 'make_cr')
+def user_make_cr(actor, user):
+    student_profile = profile(user, 'student_profile')
+    if student_profile is None or student_profile.is_cr or not email_verified(user):
+        return False
+    if is_manager(actor):
+        return True
+    actor_profile = profile(actor, 'student_profile')
+    return bool(actor_profile and actor_profile.is_cr and
+                actor_profile.registration_year == student_profile.registration_year and
+                actor_profile.course == student_profile.course)
+
+
+@rule('user.User', 'remove_cr')
+def user_remove_cr(actor, user):
+    student_profile = profile(user, 'student_profile')
+    if student_profile is None or not student_profile.is_cr:
+        return False
+    return is_manager(actor) or is_self(actor, user.pk)
+
+
+@rule('user.User', 'make_hod')
+def user_make_hod(actor, user):
+    staff_profile = profile(user, 'staff_profile')
+    if staff_profile is None or staff_profile.is_hod or not email_verified(user):
+        return False
+    if actor.is_superuser:
+        return True
+    actor_profile = profile(actor, 'staff_profile')
+    return bool(actor_profile and actor_profile.is_hod)
+
+
+@rule('user.User', 'make_tpc_head')
+def user_make_tpc_head(actor, user):
+    staff_profile = profile(user, 'staff_profile')
+    if staff_profile is None or staff_profile.is_tpc_head or not email_verified(user):
+        return False
+    if actor.is_superuser:
+        return True
+    actor_profile = profile(actor, 'staff_profile')
+    return bool(actor_profile and (actor_profile.is_hod or actor_profile.is_tpc_head))
+
+
+# Objects owned by a user: contact details, resume entries
+
+
+def user_owned(actor, obj):
+    return owner_or_superuser(actor, obj.user_id, lambda: obj.user)
+
+
+for label in ['user.Address', 'user.Link', 'resume.OtherEducation', 'resume.Certification', 'resume.WorkExperience',
+              'resume.Project', 'resume.Patent', 'resume.Publication', 'resume.Achievement', 'resume.Presentation',
+              'resume.OtherInfo']:
+    rule(label, 'edit', 'delete')(user_owned)
+
+rule('user.Link', 'set_primary')(user_owned)
+
+
+@rule('user.PhoneNumber', 'set_primary', 'delete')
+def phone_number_change(actor, phone_number):
+    if phone_number.user_id is None or phone_number.pk == phone_number.user.primary_phone_number_id:
+        return False
+    return user_owned(actor, phone_number)
+
+
+@rule('user.Email', 'delete')
+def email_delete(actor, email):
+    if email.user_id is None or email.pk == email.user.primary_email_id:
+        return False
+    return user_owned(actor, email)
+
+
+@rule('user.Email', 'set_primary')
+def email_set_primary(actor, email):
+    if not email.is_verified:
+        return False
+    return email_delete(actor, email)
+
+
+@rule('user.Email', 'verify')
+def email_verify(actor, email):
+    if email.is_verified:
+        return False
+    return actor.is_superuser or is_self(actor, email.user_id)
+
+
+@rule('user.Address', 'set_primary', 'delete')
+def address_change(actor, address):
+    if address.user_id is None or address.pk == address.user.primary_address_id:
+        return False
+    return user_owned(actor, address)
+
+
+# Profiles
+
+
+@rule('student.StudentProfile', 'edit')
+@rule('staff.StaffProfile', 'edit')
+@rule('recruiter.RecruiterProfile', 'edit')
+def profile_edit(actor, profile):
+    return can(actor, 'edit', profile.user)
+
+
+@rule('student.StudentProfile', 'view')
+@rule('staff.StaffProfile', 'view')
+@rule('recruiter.RecruiterProfile', 'view')
+def profile_view(actor, profile):
+    return can(actor, 'view', profile.user)
+
+
+@rule('student.StudentProfile', 'import_grades')
+def student_profile_import_grades(actor, student_profile):
+    if is_manager(actor):
+        return True
+    actor_profile = profile(actor, 'student_profile')
+    return bool(actor_profile and actor_profile.is_cr and actor_profile.course == student_profile.course and
+                actor_profile.registration_year == student_profile.registration_year)
+
+
+@rule('student.SemesterReportCard', 'edit')
+def semester_report_card_edit(actor, semester_report_card):
+    student_profile = semester_report_card.student_profile
+    return owner_or_superuser(actor, student_profile.user_id, lambda: student_profile.user)
+
+
+@rule('student.SemesterReportCardTemplate', 'view')
+def semester_report_card_template_view(actor, template):
+    return True
+
+
+@rule('student.SemesterReportCardTemplate', 'edit')
+def semester_report_card_template_edit(actor, template):
+    if is_manager(actor):
+        return True
+    actor_profile = profile(actor, 'student_profile')
+    return bool(actor_profile and actor_profile.is_cr and actor_profile.course == template.course)
+
+
+# Cell
+
+
+@rule('cell.Notice', 'edit')
+def notice_edit(actor, notice):
+    return actor.is_superuser
+
+
+@rule('cell.Message', 'view', 'handle')
+def message_handle(actor, message):
+    return actor.is_superuser and actor.is_coordinator
+
+
+@rule('cell.Quote', 'edit', 'delete')
+def quote_change(actor, quote):
+    return actor.is_superuser or is_self(actor, quote.user_id)
+
+
+@rule('cell.RecruitmentPost', 'edit')
+def recruitment_post_edit(actor, post):
+    if actor.is_superuser or is_self(actor, post.user_id):
+        return True
+    if post.user_id is None:
+        return actor.is_coordinator
+    return actor.is_coordinator and not post.user.is_superuser
+
+
+@rule('cell.RecruitmentPost', 'add_skill', 'remove_skill')
+def recruitment_post_change_skills(actor, post):
+    return is_manager(actor) or is_self(actor, post.user_id)
+
+
+@rule('cell.RecruitmentPost', 'view_application', 'select_application', 'reject_application',
+      'shortlist_application', 'pending_application')
+def recruitment_post_manage_applications(actor, post):
+    return actor.is_superuser or is_self(actor, post.user_id)
+
+
+@rule('cell.RecruitmentApplication', 'select', 'reject', 'shortlist')
+def recruitment_application_decide(actor, application):
+    if application.status != 'P':
+        return False
+    return recruitment_post_manage_applications(actor, application.recruitment_post)
+
+
+@rule('cell.RecruitmentApplication', 'pending')
+def recruitment_application_pending(actor, application):
+    if application.status == 'P':
+        return False
+    return recruitment_post_manage_applications(actor, application.recruitment_post)
@@ -0,0 +1,133 @@
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Node
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+
+logger = logging.getLogger('querybudget')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+literal = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+placeholder_list = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+whitespace = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    sql = placeholder_list.sub('(...)', literal.sub('?', sql))
+    return whitespace.sub(' ', sql).strip()
+
+
+def get_template_site(frame):
+    node = frame.f_locals.get('self')
+    if not isinstance(node, Node) or getattr(node, 'token', None) is None or getattr(node, 'origin', None) is None:
+        return None
+    return f'{node.origin.template_name or node.origin.name}:{node.token.lineno}'
+
+
+def get_call_site():
+    root = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if os.sep + 'django' + os.sep + 'template' + os.sep in filename:
+            site = get_template_site(frame)
+            if site:
+                return site
+        elif (filename.startswith(root) and 'site-packages' not in filename and filename != __file__ and
+              os.path.basename(filename) != 'manage.py'):
+            return f'{os.path.relpath(filename, root)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return 'framework code'
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints.setdefault(fingerprint(sql), Counter())[get_call_site()] += 1
+
+    def get_suspects(self, threshold):
+        suspects = []
+        for key, call_sites in self.fingerprints.items():
+            count = sum(call_sites.values())
+            if count >= threshold:
+                suspects.append((key, count, call_sites.most_common(1)[0][0]))
+        return sorted(suspects, key=lambda suspect: -suspect[1])
+
+    def record(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+def get_budget(url_name):
+    return settings.QUERY_BUDGETS.get(url_name, settings.QUERY_BUDGET_DEFAULT)
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENABLED or not (settings.DEBUG or settings.QUERY_BUDGET_SAMPLE_RATE):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DEBUG and random.random() >= settings.QUERY_BUDGET_SAMPLE_RATE:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.get_response(request)
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self.stream(request, response.streaming_content, recorder)
+        else:
+            self.report(request, recorder, response)
+        return response
+
+    def stream(self, request, content, recorder):
+        with recorder.record():
+            yield from content
+        self.report(request, recorder)
+
+    def report(self, request, recorder, response=None):
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        if response is not None and settings.DEBUG:
+            response['X-Query-Count'] = recorder.count
+            response['X-Query-Time'] = f'{recorder.duration * 1000:.1f}ms'
+        logger.info('%s %s [%s] %d queries in %.1fms', request.method, request.path, url_name, recorder.count,
+                    recorder.duration * 1000)
+
+        suspects = recorder.get_suspects(settings.QUERY_BUDGET_REPEAT_THRESHOLD)
+        for key, count, call_site in suspects:
+            logger.warning('N+1 suspect on %s [%s]: %d x %.200s at %s', request.path, url_name, count, key, call_site)
+        if suspects and response is not None and settings.DEBUG:
+            response['X-Query-Suspects'] = len(suspects)
+
+        budget = get_budget(url_name)
+        if budget is not None and recorder.count > budget:
+            message = f'{request.path} [{url_name}] ran {recorder.count} queries, budget is {budget}'
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
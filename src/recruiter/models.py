@@ -1,7 +1,7 @@
 from django.db import models
-from django.db.models import Q
 from user.models import User
 from django.utils.functional import cached_property
+from permissions import Permitted
 
 
 # Create your models here.
@@ -17,11 +17,11 @@ class RecruiterProfile(models.Model):
 
     @cached_property
     def edit_users(self):
-        return self.user.edit_users
+        return Permitted('edit', self)
 
     @cached_property
     def view_users(self):
-        return self.user.view_users
+        return Permitted('view', self)
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
@@ -1,9 +1,9 @@
 from django.db import models
 from django.db.models.functions import Lower
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db.models import Q
 from user.models import User
 from django.utils.functional import cached_property
+from permissions import Permitted
 
 
 # Create your models here.
@@ -129,17 +129,11 @@ class OtherEducation(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def save(self, *args, **kwargs):
         self.user.save()
@@ -172,17 +166,11 @@ class Certification(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return f'{self.title} from {self.issuer}'
@@ -276,17 +264,11 @@ class WorkExperience(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return f'{self.title} at {self.company}'
@@ -318,17 +300,11 @@ class Project(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def get_name_url_tuple(self):
         urls = self.urls.split(',')
@@ -370,17 +346,11 @@ class Patent(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return self.title
@@ -409,17 +379,11 @@ class Publication(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return self.title
@@ -447,17 +411,11 @@ class Achievement(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return self.title
@@ -486,17 +444,11 @@ class Presentation(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return self.title
@@ -520,17 +472,11 @@ class OtherInfo(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return self.title
\ No newline at end of file
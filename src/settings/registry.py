@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from caching import ProcessCache
+from .models import Setting
+
+
+@dataclass
+class Definition:
+    default: object
+    type: type = str
+    choices: tuple = None
+    description: str = ''
+
+    def parse(self, value):
+        if value is None or value == '':
+            return self.default
+        try:
+            if self.type is bool:
+                value = value.strip().lower() in ('1', 'true', 'yes', 'on')
+            else:
+                value = self.type(value)
+        except ValueError:
+            return self.default
+        if self.choices and value not in self.choices:
+            return self.default
+        return value
+
+    def serialize(self, value):
+        if self.type is bool:
+            return 'true' if value else 'false'
+        return str(value)
+
+
+definitions = {
+    'current_academic_half': Definition('odd', choices=('odd', 'even'),
+                                        description='Half of the academic year currently running.'),
+}
+
+
+def load():
+    values = {key: definition.default for key, definition in definitions.items()}
+    for key, value in Setting.objects.filter(key__in=definitions).values_list('key', 'value'):
+        values[key] = definitions[key].parse(value)
+    return values
+
+
+cached = ProcessCache(load, 'SETTINGS_REGISTRY_TIMEOUT')
+
+
+def invalidate():
+    cached.invalidate()
+
+
+def get_values():
+    return cached.get()
+
+
+def get(key):
+    if key not in definitions:
+        raise KeyError(f'Unknown setting {key!r}')
+    return get_values()[key]
+
+
+def update(key, value):
+    definition = definitions[key]
+    if definition.choices and value not in definition.choices:
+        raise ValueError(f'{value!r} is not a valid value for {key!r}')
+    Setting.objects.update_or_create(key=key, defaults={
+        'value': definition.serialize(value),
+        'description': definition.description,
+    })
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from .models import Setting
+from . import registry
+
+
+def invalidate_registry(sender, **kwargs):
+    registry.invalidate()
+
+
+post_save.connect(invalidate_registry, sender=Setting, dispatch_uid='settings_registry_save')
+post_delete.connect(invalidate_registry, sender=Setting, dispatch_uid='settings_registry_delete')
@@ -0,0 +1,70 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from django.db import transaction
+from .models import StudentProfile, SemesterReportCard
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@dataclass
+class RecomputeReport:
+    dry_run: bool
+    profiles: int = 0
+    changed: int = 0
+    fields: Counter = field(default_factory=Counter)
+    seconds: float = 0
+
+
+def aggregate_by_profile(profile_ids):
+    if np is None:
+        return SemesterReportCard.objects.aggregate_by_profile(profile_ids)
+
+    rows = SemesterReportCard.objects.filter(student_profile_id__in=profile_ids).order_by(
+        'student_profile_id', 'semester_number').values_list(
+        'student_profile_id', 'sgpa', 'total_credits', 'is_complete', 'backlogs', 'passed', 'year_of_exam')
+    cards = np.array(list(rows), dtype=float).reshape(-1, 7)
+    if not len(cards):
+        return {}
+
+    profiles, index = np.unique(cards[:, 0].astype(np.int64), return_inverse=True)
+    complete = cards[:, 3].astype(bool)
+    weighted_sgpa = np.bincount(index, weights=np.where(complete, cards[:, 1] * cards[:, 2], 0), minlength=len(profiles))
+    complete_credits = np.bincount(index, weights=np.where(complete, cards[:, 2], 0), minlength=len(profiles))
+    backlog_count = np.bincount(index, weights=cards[:, 4], minlength=len(profiles))
+    passed_semesters = np.bincount(index, weights=cards[:, 5], minlength=len(profiles))
+    last_year_of_exam = np.zeros(len(profiles))
+    np.maximum.at(last_year_of_exam, index, cards[:, 6])
+
+    return {
+        profile: {
+            'weighted_sgpa': values[0],
+            'complete_credits': values[1],
+            'backlog_count': int(values[2]),
+            'passed_semesters': int(values[3]),
+            'last_year_of_exam': int(values[4]),
+        }
+        for profile, values in zip(profiles.tolist(), np.column_stack(
+            [weighted_sgpa, complete_credits, backlog_count, passed_semesters, last_year_of_exam]).tolist())
+    }
+
+
+def recompute(profiles, batch_size=500, dry_run=False):
+    report = RecomputeReport(dry_run)
+    start = time.perf_counter()
+    for batch, changed in profiles.academic_changes(batch_size, aggregate_by_profile):
+        report.profiles += len(batch)
+        report.changed += len(changed)
+        for fields in changed.values():
+            report.fields.update(fields)
+        if changed and not dry_run:
+            with transaction.atomic():
+                StudentProfile.objects.bulk_update(
+                    changed, sorted({name for names in changed.values() for name in names}))
+    if report.changed and not dry_run:
+        StudentProfile.objects.data_version.invalidate()
+    report.seconds = time.perf_counter() - start
+    return report
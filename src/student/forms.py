@@ -1,5 +1,6 @@
 from django.contrib.auth import authenticate
 from django import forms
+from django.core.validators import MaxValueValidator
 from .models import *
 from user.models import Email
 import datetime
@@ -132,3 +133,19 @@ class SemesterReportCardTemplateForm(forms.ModelForm):
     class Meta:
         model = SemesterReportCardTemplate
         exclude = ('course', 'semester')
+
+
+class GradeSheetImportForm(forms.Form):
+    course = forms.ChoiceField(choices=StudentProfile.course_choices, widget=forms.Select(attrs={'class': 'form-select'}))
+    semester = forms.IntegerField(min_value=1, max_value=12, widget=forms.NumberInput(attrs={'class': 'form-control'}))
+    year_of_exam = forms.IntegerField(required=False, min_value=2000, validators=[MaxValueValidator(current_year)],
+                                      widget=forms.NumberInput(attrs={'class': 'form-control'}),
+                                      help_text='Used for rows without a year_of_exam column value')
+    grade_sheet = forms.FileField(widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'}),
+                                  help_text='CSV or XLSX with registration_number, then "<code>" and "<code> points" columns for every subject')
+    dry_run = forms.BooleanField(required=False, initial=True, widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+                                 label='Only validate, do not save')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.label_suffix = ''
@@ -0,0 +1,246 @@
+from dataclasses import dataclass, field
+from django.db import transaction
+from permissions import can
+from .models import StudentProfile, SemesterReportCard, SemesterReportCardTemplate, SubjectResult, current_year
+import csv
+import io
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+card_fields = ['year_of_exam', 'subjects', 'subject_codes', 'subject_credits', 'subject_letter_grades',
+               'subject_passing_grade_points', 'subject_grade_points', 'backlogs', 'passed', 'total_credits',
+               'earned_credits', 'sgpa', 'is_complete']
+
+
+class GradeSheetError(Exception):
+    pass
+
+
+@dataclass
+class RowError:
+    row: int
+    registration_number: str
+    message: str
+
+
+@dataclass
+class ImportReport:
+    course: str
+    semester: int
+    dry_run: bool
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    placeholders: int = 0
+    recomputed: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row, registration_number, message):
+        self.errors.append(RowError(row, registration_number, message))
+
+
+def parse_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        number = float(value)
+        if not number.is_integer():
+            raise
+        return int(number)
+
+
+def read_sheet(file, name):
+    if name.lower().endswith('.xlsx'):
+        if openpyxl is None:
+            raise GradeSheetError('Reading .xlsx grade sheets needs openpyxl, upload a CSV file instead.')
+        try:
+            workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        except Exception:
+            raise GradeSheetError('The file is not a valid .xlsx workbook.')
+        rows = [['' if value is None else str(value).strip() for value in row]
+                for row in workbook.active.iter_rows(values_only=True)]
+    else:
+        text = file.read()
+        if isinstance(text, bytes):
+            try:
+                text = text.decode('utf-8-sig')
+            except UnicodeDecodeError:
+                raise GradeSheetError('CSV grade sheets must be UTF-8 encoded.')
+        rows = [[value.strip() for value in row] for row in csv.reader(io.StringIO(text))]
+
+    rows = [(number, row) for number, row in enumerate(rows, 1) if any(row)]
+    if not rows:
+        raise GradeSheetError('The grade sheet is empty.')
+    return rows[0][1], rows[1:]
+
+
+def get_columns(header, template):
+    columns = {}
+    for index, name in enumerate(header):
+        key = name.lower().replace(' ', '_')
+        if key in ('registration_number', 'year_of_exam'):
+            columns[key] = index
+        elif name.lower().endswith(' points'):
+            columns[(name[:-len(' points')].strip(), 'points')] = index
+        elif name:
+            columns[(name, 'grade')] = index
+
+    if 'registration_number' not in columns:
+        raise GradeSheetError('The grade sheet needs a registration_number column.')
+    codes = set(template.subject_codes)
+    unknown = sorted({code for code, kind in (key for key in columns if isinstance(key, tuple))} - codes)
+    if unknown:
+        raise GradeSheetError(f'Subjects not in the {template.course} semester {template.semester} template: '
+                              f'{", ".join(unknown)}.')
+    missing = [f'{code}{suffix}' for code in template.subject_codes for kind, suffix in [('grade', ''), ('points', ' points')]
+               if (code, kind) not in columns]
+    if missing:
+        raise GradeSheetError(f'Missing columns: {", ".join(missing)}.')
+    return columns
+
+
+def parse_grades(row, columns, template):
+    letter_grades, grade_points = [], []
+    for code in template.subject_codes:
+        letter_grade = row[columns[(code, 'grade')]].upper() if columns[(code, 'grade')] < len(row) else ''
+        points = row[columns[(code, 'points')]] if columns[(code, 'points')] < len(row) else ''
+        if letter_grade not in SemesterReportCard.letter_grades:
+            raise ValueError(f'Invalid letter grade {letter_grade!r} for {code}, '
+                             f'expected one of {", ".join(SemesterReportCard.letter_grades)}.')
+        try:
+            points = float(points)
+        except ValueError:
+            raise ValueError(f'Invalid grade points {points!r} for {code}.')
+        if not 0 <= points <= 10:
+            raise ValueError(f'Grade points for {code} must be between 0 and 10.')
+        letter_grades.append(letter_grade)
+        grade_points.append(int(points) if points.is_integer() else points)
+    return letter_grades, grade_points
+
+
+def fill_card(card, template, letter_grades, grade_points):
+    card.subjects = list(template.subjects)
+    card.subject_codes = list(template.subject_codes)
+    card.subject_credits = list(template.subject_credits)
+    card.subject_passing_grade_points = list(template.subject_passing_grade_points)
+    card.subject_letter_grades = letter_grades
+    card.subject_grade_points = grade_points
+    total_credits, earned_credits, weighted_grade_points, backlogs = card.get_totals(card.get_subject_results())
+    card.total_credits = round(total_credits, 1)
+    card.backlogs = backlogs
+    card.passed = backlogs == 0
+    card.earned_credits = round(earned_credits, 2)
+    card.sgpa = round(weighted_grade_points / card.total_credits if card.total_credits > 0 else 0, 2)
+    card.is_complete = True
+    return card
+
+
+def import_grade_sheet(file, name, course, semester, year_of_exam=None, user=None, dry_run=False):
+    report = ImportReport(course, semester, dry_run)
+    template = SemesterReportCardTemplate.objects.lookup(course, semester)
+    if template is None:
+        raise GradeSheetError(f'There is no {course} semester {semester} template to validate against.')
+    header, rows = read_sheet(file, name)
+    columns = get_columns(header, template)
+    report.rows = len(rows)
+
+    registration_numbers = {}
+    for number, row in rows:
+        try:
+            registration_numbers[number] = parse_int(row[columns['registration_number']])
+        except (ValueError, IndexError):
+            registration_numbers[number] = None
+    profiles = StudentProfile.objects.filter(
+        registration_number__in=[value for value in registration_numbers.values() if value is not None]
+    ).in_bulk(field_name='registration_number')
+    profile_ids = [profile.pk for profile in profiles.values()]
+    with transaction.atomic():
+        # Unnumbered cards would be missed below and get duplicated by placeholders, a dry run numbers them only
+        # for the lookup
+        SemesterReportCard.objects.number_cards(profile_ids)
+        cards = {
+            (card.student_profile_id, card.semester_number): card
+            for card in SemesterReportCard.objects.filter(student_profile__in=profile_ids, semester_number__lte=semester)
+        }
+        if dry_run:
+            transaction.set_rollback(True)
+
+    seen = set()
+    changed, created, placeholders = [], [], []
+    for number, row in rows:
+        registration_number = registration_numbers[number]
+        label = row[columns['registration_number']] if columns['registration_number'] < len(row) else ''
+        profile = profiles.get(registration_number)
+        if registration_number is None:
+            report.add_error(number, label, 'Invalid registration number.')
+            continue
+        if profile is None:
+            report.add_error(number, label, 'No student with this registration number.')
+            continue
+        if registration_number in seen:
+            report.add_error(number, label, 'The student appears more than once in the sheet.')
+            continue
+        seen.add(registration_number)
+        if profile.course != course:
+            report.add_error(number, label, f'The student is enrolled in {profile.course}, not {course}.')
+            continue
+        if user is not None and not can(user, 'import_grades', profile):
+            report.add_error(number, label, 'You are not allowed to import grades for this student.')
+            continue
+        if profile.manually_specify_cgpa:
+            report.add_error(number, label, 'The student has specified their academic performance manually.')
+            continue
+        if profile.semester < semester:
+            report.add_error(number, label, f'The student is only in semester {profile.semester}.')
+            continue
+
+        try:
+            letter_grades, grade_points = parse_grades(row, columns, template)
+            exam_year = year_of_exam
+            if 'year_of_exam' in columns and columns['year_of_exam'] < len(row) and row[columns['year_of_exam']]:
+                exam_year = parse_int(row[columns['year_of_exam']])
+            if exam_year is not None and not 2000 <= exam_year <= current_year():
+                raise ValueError(f'Invalid year of exam {exam_year}.')
+        except ValueError as error:
+            report.add_error(number, label, str(error))
+            continue
+
+        for missing in range(1, semester):
+            if (profile.pk, missing) not in cards:
+                placeholder = SemesterReportCard.objects.build_card(profile, missing)
+                cards[(profile.pk, missing)] = placeholder
+                placeholders.append(placeholder)
+
+        card = cards.get((profile.pk, semester))
+        if card is None:
+            card = SemesterReportCard(student_profile=profile, semester_number=semester)
+            created.append(card)
+        previous = [getattr(card, name) for name in card_fields]
+        fill_card(card, template, letter_grades, grade_points)
+        if exam_year is not None:
+            card.year_of_exam = exam_year
+        if card.pk is None:
+            continue
+        if [getattr(card, name) for name in card_fields] == previous:
+            report.unchanged += 1
+        else:
+            changed.append(card)
+
+    report.created, report.updated, report.placeholders = len(created), len(changed), len(placeholders)
+    if dry_run or not (created or changed or placeholders):
+        return report
+
+    with transaction.atomic():
+        SemesterReportCard.objects.bulk_create(placeholders + created)
+        SemesterReportCard.objects.bulk_update(changed, card_fields)
+        SubjectResult.objects.filter(report_card__in=changed).delete()
+        SubjectResult.objects.bulk_create(
+            [result for card in placeholders + created + changed for result in card.get_subject_results()])
+        report.recomputed = StudentProfile.objects.filter(
+            pk__in={card.student_profile_id for card in placeholders + created + changed}).recompute_academics()
+    return report
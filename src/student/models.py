@@ -1,59 +1,116 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from datetime import datetime
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from caching import ProcessCache, Version
 from user.models import User
-from settings.models import Setting
+from settings import registry
 from django.utils.functional import cached_property
+from permissions import Permitted
 
 
 # Create your models here.
 
 
 class StudentProfile(models.Model):
-    class StudentProfileManager(models.Manager):
-
-        def get_queryset(self):
-            current_academic_half = Setting.objects.get(
-                key='current_academic_half').value
-            return super().get_queryset().annotate(
-                academic_half=models.Value(
-                    current_academic_half, output_field=models.CharField()),
-                year=models.Case(
-                    models.When(
-                        passed_out=True,
-                        then=models.F('course_duration')),
-                    models.When(
-                        registration_year__lte=datetime.now().year - models.F('course_duration'),
-                        then=models.F('course_duration')
-                    ),
-                    default=models.ExpressionWrapper(datetime.now(
-                    ).year - models.F('registration_year'), output_field=models.IntegerField()),
-                    output_field=models.IntegerField()
+    class QuerySet(models.QuerySet):
+        def current(self):
+            return self.filter(is_current=True)
+
+        def alumni(self):
+            return self.filter(passed_out=True)
+
+        def dropouts(self):
+            return self.filter(dropped_out=True)
+
+        def of_batch(self, registration_year):
+            return self.filter(registration_year=registration_year)
+
+        def of_course(self, *courses):
+            return self.filter(course__in=courses)
+
+        def in_year(self, year):
+            return self.filter(year=year)
+
+        def with_grade_in(self, code, *letter_grades):
+            return self.filter(
+                semester_report_cards__subject_results__code=code,
+                semester_report_cards__subject_results__letter_grade__in=letter_grades,
+            ).distinct()
+
+        def in_semester(self, semester):
+            return self.filter(semester=semester)
+
+        def update_academic_positions(self, academic_half=None):
+            this_year = datetime.now().year
+            academic_half = academic_half or registry.get('current_academic_half')
+            year = models.Case(
+                models.When(
+                    passed_out=True,
+                    then=models.F('course_duration')),
+                models.When(
+                    registration_year__lte=this_year - models.F('course_duration'),
+                    then=models.F('course_duration')
+                ),
+                default=models.ExpressionWrapper(
+                    this_year - models.F('registration_year'), output_field=models.IntegerField()),
+                output_field=models.IntegerField()
+            )
+            semester = models.ExpressionWrapper(
+                year * 2 - 1 if academic_half == 'odd' else year * 2, output_field=models.IntegerField())
+            roll = models.Case(
+                models.When(
+                    is_current=True,
+                    then=models.functions.Concat(
+                        semester, models.Value(this_year % 100), models.F('registration_year') % 100,
+                        output_field=models.CharField())
                 ),
-                semester=models.Case(
-                    models.When(
-                        academic_half='odd',
-                        then=models.F('year') * 2 - 1),
-                    default=models.F('year') * 2,
-                    output_field=models.IntegerField()
+                models.When(
+                    passed_out=True,
+                    then=models.functions.Concat(
+                        semester, models.F('pass_out_year') % 100, models.F('registration_year') % 100,
+                        output_field=models.CharField())
                 ),
-                roll=models.Case(
-                    models.When(
-                        is_current=True,
-                        then=models.ExpressionWrapper(models.functions.Concat(models.F('semester'), datetime.now(
-                        ).year % 100, models.F('registration_year') % 100), output_field=models.CharField())
-                    ),
-                    models.When(
-                        passed_out=True,
-                        then=models.ExpressionWrapper(models.functions.Concat(models.F('semester'), models.F(
-                            'pass_out_year') % 100, models.F('registration_year') % 100), output_field=models.CharField())
-                    ),
-                    default=models.Value(
-                        'SSYYRR', output_field=models.CharField()),
-                    output_field=models.CharField()
-                )
+                default=models.Value('SSYYRR'),
+                output_field=models.CharField()
             )
+            count = self.exclude(year=year, semester=semester, roll=roll).update(year=year, semester=semester, roll=roll)
+            if count:
+                StudentProfile.objects.data_version.invalidate()
+            return count
+
+        def academic_changes(self, batch_size=500, aggregate=None):
+            aggregate = aggregate or SemesterReportCard.objects.aggregate_by_profile
+            academic_half = registry.get('current_academic_half')
+            profiles = self.order_by('pk')
+            last_pk = None
+            while True:
+                batch = profiles if last_pk is None else profiles.filter(pk__gt=last_pk)
+                batch = list(batch[:batch_size])
+                if not batch:
+                    return
+                last_pk = batch[-1].pk
+                aggregates = aggregate([profile.pk for profile in batch])
+                changed = {}
+                for profile in batch:
+                    fields = profile.apply_academic_aggregate(aggregates.get(profile.pk, {}), academic_half)
+                    if fields:
+                        changed[profile] = fields
+                yield batch, changed
+
+        def recompute_academics(self, batch_size=500):
+            count = 0
+            for batch, changed in self.academic_changes(batch_size):
+                if changed:
+                    fields = {name for names in changed.values() for name in names}
+                    StudentProfile.objects.bulk_update(changed, sorted(fields))
+                    count += len(changed)
+            if count:
+                StudentProfile.objects.data_version.invalidate()
+            return count
+
+    class StudentProfileManager(models.Manager.from_queryset(QuerySet)):
+        # Bumped whenever exported student data changes, see CSVStreamMixin.get_export_stamp
+        data_version = Version('student-data-version')
 
     objects = StudentProfileManager()
 
@@ -61,6 +118,13 @@ class StudentProfile(models.Model):
         verbose_name = 'Student Profile'
         verbose_name_plural = 'Student Profiles'
         base_manager_name = 'objects'
+        indexes = [
+            models.Index(fields=['is_current', 'course', 'registration_year']),
+            models.Index(fields=['is_current', 'course', 'semester']),
+            models.Index(fields=['passed_out', 'pass_out_year']),
+            models.Index(fields=['dropped_out']),
+            models.Index(fields=['registration_year', 'course']),
+        ]
 
     course_choices = [
         ('B.Tech', 'Bachelor of Technology'),
@@ -68,23 +132,17 @@ class StudentProfile(models.Model):
         ('PhD', 'Doctor of Philosophy')
     ]
 
-    class CurrentStudentProfile(models.Manager):
+    class CurrentStudentProfile(StudentProfileManager):
         def get_queryset(self):
-            q = super().get_queryset()
-            q_ids = [o.id for o in q if o.is_current]
-            q = q.filter(id__in=q_ids)
-            return q
+            return super().get_queryset().current()
 
-    class PassedOutStudentProfile(models.Manager):
+    class PassedOutStudentProfile(StudentProfileManager):
         def get_queryset(self):
-            q = super().get_queryset()
-            q_ids = [o.id for o in q if o.passed_out]
-            q = q.filter(id__in=q_ids)
-            return q
+            return super().get_queryset().alumni()
 
-    class DroppedOutStudentProfile(models.Manager):
+    class DroppedOutStudentProfile(StudentProfileManager):
         def get_queryset(self):
-            return super().get_queryset().filter(dropped_out=True)
+            return super().get_queryset().dropouts()
 
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name='student_profile')
@@ -112,14 +170,17 @@ class StudentProfile(models.Model):
     cgpa = models.FloatField(default=0)
     course_duration = models.PositiveSmallIntegerField()
     manually_specify_cgpa = models.BooleanField(default=False)
+    year = models.SmallIntegerField(default=0, editable=False, db_index=True)
+    semester = models.SmallIntegerField(default=0, editable=False, db_index=True)
+    roll = models.CharField(max_length=10, default='SSYYRR', editable=False, db_index=True)
 
     @cached_property
     def edit_users(self):
-        return self.user.edit_users
+        return Permitted('edit', self)
 
     @cached_property
     def view_users(self):
-        return self.user.view_users
+        return Permitted('view', self)
 
     @cached_property
     def year_suffix(self):
@@ -167,37 +228,74 @@ class StudentProfile(models.Model):
             total_credits = total_credits + semester_report_card.total_credits
         return (cgpa / total_credits) if total_credits > 0 else 0
 
+    def set_academic_position(self, academic_half=None):
+        this_year = datetime.now().year
+        academic_half = academic_half or registry.get('current_academic_half')
+        if self.passed_out or self.registration_year <= this_year - self.course_duration:
+            self.year = self.course_duration
+        else:
+            self.year = this_year - self.registration_year
+        self.semester = self.year * 2 - 1 if academic_half == 'odd' else self.year * 2
+        if self.is_current:
+            self.roll = f'{self.semester}{this_year % 100}{self.registration_year % 100}'
+        elif self.passed_out:
+            pass_out_year = '' if self.pass_out_year is None else self.pass_out_year % 100
+            self.roll = f'{self.semester}{pass_out_year}{self.registration_year % 100}'
+        else:
+            self.roll = 'SSYYRR'
+
+    def apply_academic_aggregate(self, aggregate, academic_half=None):
+        previous = {name: getattr(self, name) for name in academic_fields}
+        if aggregate is not None and not self.manually_specify_cgpa:
+            credits = aggregate.get('complete_credits') or 0
+            self.cgpa = aggregate['weighted_sgpa'] / credits if credits > 0 else 0
+            self.backlog_count = aggregate.get('backlog_count') or 0
+            self.passed_semesters = aggregate.get('passed_semesters') or 0
+            if previous['backlog_count'] > 0:
+                if self.backlog_count == 0 and self.passed_semesters >= self.course_duration * 2:
+                    self.pass_out_year = aggregate['last_year_of_exam']
+                else:
+                    self.pass_out_year = None
+        self.passed_out = self.passed_semesters >= self.course_duration * 2
+        self.is_current = self.passed_semesters < self.course_duration * 2
+        self.set_academic_position(academic_half)
+        return [name for name in academic_fields if getattr(self, name) != previous[name]]
+
+    def refresh_academics(self):
+        aggregate = SemesterReportCard.objects.aggregate_by_profile([self.pk]).get(self.pk, {})
+        fields = self.apply_academic_aggregate(aggregate)
+        if fields:
+            self.save(update_fields=fields)
+        return fields
+
     def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is not None:
+            return super().save(*args, **kwargs)
         self.registration_year = int(f'{self.registration_number}'[:4])
         self.id_card = f'{self.registration_year % 100}CSE{"BTC" if self.course == "B.Tech" else "MTC" if self.course == "M.Tech" else "PHD"}{self.id_number:03d}'
         self.course_duration = 4 if self.course == 'B.Tech' else 2 if self.course == 'M.Tech' else 6
-        if self.pk and StudentProfile.objects.filter(pk=self.pk).exists():
+        self.set_academic_position()
+        aggregate = None
+        if not self._state.adding:
             if self.manually_specify_cgpa:
                 self.semester_report_cards.all().delete()
             else:
-                while self.semester_report_cards.count() < self.semester:
-                    SemesterReportCard.objects.create(student_profile=self)
-                self.cgpa = self.calculate_cgpa()
-                self.backlog_count = sum(
-                    [semester_report_card.backlogs for semester_report_card in self.semester_report_cards.all()])
-                self.passed_semesters = sum(
-                    [1 for semester_report_card in self.semester_report_cards.all() if semester_report_card.passed])
-                if StudentProfile.objects.get(pk=self.pk).backlog_count > 0:
-                    if self.backlog_count == 0 and self.passed_semesters >= self.course_duration * 2:
-                        self.pass_out_year = max([semester_report_card.year_of_exam for semester_report_card in self.semester_report_cards.all()])
-                    else:
-                        self.pass_out_year = None
-        self.passed_out = self.passed_semesters >= self.course_duration * 2
-        self.is_current = self.passed_semesters < self.course_duration * 2
-        if self.is_cr:
+                SemesterReportCard.objects.materialize_cards([self])
+                aggregate = SemesterReportCard.objects.aggregate_by_profile([self.pk]).get(self.pk, {})
+        self.apply_academic_aggregate(aggregate)
+        if self.is_cr and not self.user.is_approved:
             self.user.is_approved = True
+            self.user.save()
         super().save(*args, **kwargs)
-        self.user.save()
 
     def __str__(self):
         return self.user.first_name + ' ' + self.user.last_name + ' (' + self.roll + ')'
 
 
+academic_fields = ['cgpa', 'backlog_count', 'passed_semesters', 'pass_out_year', 'passed_out', 'is_current', 'year',
+                   'semester', 'roll']
+
+
 class CurrentStudentProfile(StudentProfile):
     objects = StudentProfile.CurrentStudentProfile()
 
@@ -230,21 +328,84 @@ def current_year():
 
 class SemesterReportCard(models.Model):
     class SemesterReportCardManager(models.Manager):
-
-        def get_queryset(self):
-            return super().get_queryset().annotate(
-                semester=models.Window(
-                    expression=models.functions.RowNumber(),
-                    partition_by=[models.F('student_profile')],
-                    order_by=models.F('id').asc()
-                ),
-                # roll=models.ExpressionWrapper(models.functions.Concat(models.F('semester'), models.F('year_of_exam') % 100, models.F('student_profile__registration_year') % 100), output_field=models.CharField()),
-            )
+        def number_cards(self, student_profiles=None):
+            cards = self.filter(semester_number__isnull=True)
+            if student_profiles is not None:
+                cards = cards.filter(student_profile__in=student_profiles)
+            earlier = self.filter(
+                student_profile=models.OuterRef('student_profile'), pk__lte=models.OuterRef('pk')
+            ).order_by().values('student_profile').annotate(count=models.Count('pk')).values('count')
+
+            # Cards numbered after the profile's unnumbered ones would collide with them, so every card of
+            # such a profile is renumbered in creation order
+            with transaction.atomic():
+                self.filter(student_profile__in=cards.values('student_profile')).update(semester_number=None)
+                return self.filter(semester_number__isnull=True).update(semester_number=models.Subquery(earlier))
+
+        def next_semester_number(self, student_profile):
+            numbers = self.filter(student_profile=student_profile).aggregate(
+                count=models.Count('id'), numbered=models.Count('semester_number'), last=models.Max('semester_number'))
+            if numbers['count'] != numbers['numbered']:
+                self.number_cards([student_profile])
+                return numbers['count'] + 1
+            return (numbers['last'] or 0) + 1
+
+        def build_card(self, student_profile, semester_number):
+            card = self.model(student_profile=student_profile, semester_number=semester_number)
+            card.reset(False)
+            card.total_credits = round(card.get_totals(card.get_subject_results())[0], 1)
+            return card
+
+        def materialize_cards(self, profiles):
+            profiles = [profile for profile in profiles if not profile.manually_specify_cgpa]
+            existing = {
+                row['student_profile_id']: row
+                for row in self.filter(student_profile__in=profiles).values('student_profile_id').annotate(
+                    count=models.Count('id'), numbered=models.Count('semester_number'),
+                    last=models.Max('semester_number')).order_by()
+            }
+            unnumbered = [profile_id for profile_id, row in existing.items() if row['count'] != row['numbered']]
+            if unnumbered:
+                self.number_cards(unnumbered)
+                for profile_id in unnumbered:
+                    existing[profile_id]['last'] = existing[profile_id]['count']
+            cards = []
+            for profile in profiles:
+                row = existing.get(profile.pk, {})
+                last = row.get('last') or 0
+                for semester_number in range(last + 1, last + 1 + profile.semester - row.get('count', 0)):
+                    cards.append(self.build_card(profile, semester_number))
+            if cards:
+                with transaction.atomic():
+                    self.bulk_create(cards)
+                    SubjectResult.objects.bulk_create([result for card in cards for result in card.get_subject_results()])
+            return cards
+
+        def aggregate_by_profile(self, profile_ids):
+            complete = models.Q(is_complete=True)
+            rows = self.filter(student_profile_id__in=profile_ids).values('student_profile_id').annotate(
+                weighted_sgpa=models.Sum(models.F('sgpa') * models.F('total_credits'), filter=complete),
+                complete_credits=models.Sum('total_credits', filter=complete),
+                backlog_count=models.Sum('backlogs'),
+                passed_semesters=models.Count('id', filter=models.Q(passed=True)),
+                last_year_of_exam=models.Max('year_of_exam'),
+            ).order_by()
+            return {row.pop('student_profile_id'): row for row in rows}
 
     objects = SemesterReportCardManager()
 
+    letter_grades = ['O', 'A+', 'A', 'B+', 'B', 'C', 'F']
+
+    class Meta:
+        ordering = ['student_profile', 'semester_number']
+        constraints = [
+            models.UniqueConstraint(fields=['student_profile', 'semester_number'],
+                                    name='unique_semester_report_card_number'),
+        ]
+
     student_profile = models.ForeignKey(
         StudentProfile, on_delete=models.CASCADE, related_name='semester_report_cards')
+    semester_number = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
     year_of_exam = models.PositiveIntegerField(
         default=current_year, validators=[MinValueValidator(2000), MaxValueValidator(current_year)])
     subjects = models.JSONField(default=list, blank=True, null=True)
@@ -265,68 +426,164 @@ class SemesterReportCard(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.student_profile.user.is_superuser:
-            return User.objects.filter(pk=self.student_profile.user.pk)
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.student_profile.user.pk)).distinct()
+        return Permitted('edit', self)
+
+    def get_subject_results(self):
+        return [
+            SubjectResult(report_card=self, position=position, name=name, code=code, credits=float(credits),
+                          letter_grade=letter_grade, grade_points=float(grade_points),
+                          passing_grade_points=float(passing_grade_points))
+            for position, (name, code, credits, letter_grade, grade_points, passing_grade_points) in enumerate(zip(
+                self.subjects or [], self.subject_codes or [], self.subject_credits or [],
+                self.subject_letter_grades or [], self.subject_grade_points or [],
+                self.subject_passing_grade_points or []))
+        ]
+
+    def get_totals(self, results):
+        total_credits = earned_credits = weighted_grade_points = 0
+        backlogs = 0
+        for result in results:
+            failed = result.letter_grade == 'F'
+            total_credits += result.credits
+            earned_credits += result.credits * result.grade_points / 10
+            weighted_grade_points += result.credits * (result.passing_grade_points if failed else result.grade_points)
+            backlogs += failed
+        return total_credits, earned_credits, weighted_grade_points, backlogs
 
     def get_sgpa(self):
-        sgpa = 0
-        for i in range(len(self.subjects)):
-            if self.subject_letter_grades[i] == 'F':
-                sgpa = sgpa + \
-                    float(self.subject_credits[i]) * \
-                    float(self.subject_passing_grade_points[i])
-            else:
-                sgpa = sgpa + \
-                    float(self.subject_credits[i]) * \
-                    float(self.subject_grade_points[i])
-        return (sgpa / self.total_credits) if self.total_credits > 0 else 0
+        weighted_grade_points = self.get_totals(self.get_subject_results())[2]
+        return (weighted_grade_points / self.total_credits) if self.total_credits > 0 else 0
 
     def getsemester(self):
-        try:
-            return list(self.student_profile.semester_report_cards.all()).index(self) + 1
-        except:
-            return self.student_profile.semester_report_cards.count() + 1
+        return self.semester_number
 
     def semester(self):
-        return self.getsemester()
+        return self.semester_number
 
     def reset(self, save=True):
-        if SemesterReportCardTemplate.objects.filter(course=self.student_profile.course, semester=self.getsemester()).exists():
-            template = SemesterReportCardTemplate.objects.get(
-                course=self.student_profile.course, semester=self.getsemester())
-            self.subjects = template.subjects
-            self.subject_codes = template.subject_codes
-            self.subject_credits = template.subject_credits
-            self.subject_passing_grade_points = template.subject_passing_grade_points
+        template = SemesterReportCardTemplate.objects.lookup(self.student_profile.course, self.semester_number)
+        if template is not None:
+            self.subjects = list(template.subjects)
+            self.subject_codes = list(template.subject_codes)
+            self.subject_credits = list(template.subject_credits)
+            self.subject_passing_grade_points = list(template.subject_passing_grade_points)
             self.subject_letter_grades = ['S' for _ in template.subjects]
             self.subject_grade_points = [0 for _ in template.subjects]
 
             if save:
                 self.save()
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, recompute=True, **kwargs):
+        if self.semester_number is None and self.pk:
+            SemesterReportCard.objects.number_cards([self.student_profile_id])
+            self.semester_number = SemesterReportCard.objects.filter(pk=self.pk).values_list(
+                'semester_number', flat=True).get()
+        if self.semester_number is None:
+            self.semester_number = SemesterReportCard.objects.next_semester_number(self.student_profile)
         if not self.pk or self.subjects in [None, []]:
             self.reset(False)
+            results = self.get_subject_results()
+            total_credits, earned_credits, weighted_grade_points, backlogs = self.get_totals(results)
         else:
-            self.backlogs = self.subject_letter_grades.count('F')
-            self.passed = True if 'F' not in self.subject_letter_grades else False
-            self.earned_credits = round(sum([(float(tuple[0]) * float(tuple[1]) / 10)
-                                        for tuple in list(zip(self.subject_credits, self.subject_grade_points))]), 2)
+            results = self.get_subject_results()
+            total_credits, earned_credits, weighted_grade_points, backlogs = self.get_totals(results)
+            self.backlogs = backlogs
+            self.passed = backlogs == 0
+            self.earned_credits = round(earned_credits, 2)
 
-        self.total_credits = round(
-            sum([float(subject_credit) for subject_credit in self.subject_credits]), 1)
+        self.total_credits = round(total_credits, 1)
 
         if self.pk:
-            self.sgpa = round(self.get_sgpa(), 2)
+            self.sgpa = round(weighted_grade_points / self.total_credits if self.total_credits > 0 else 0, 2)
 
-        super().save(*args, **kwargs)
+        if self._state.adding and not results:
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic():
+                adding = self._state.adding
+                super().save(*args, **kwargs)
+                if not adding:
+                    self.subject_results.all().delete()
+                SubjectResult.objects.bulk_create(results)
 
-        if self.pk:
-            self.student_profile.save()
+        if recompute:
+            self.student_profile.refresh_academics()
+
+
+class SubjectResult(models.Model):
+    class QuerySet(models.QuerySet):
+        def complete(self):
+            return self.filter(report_card__is_complete=True)
+
+        def for_subject(self, *codes):
+            return self.filter(code__in=codes)
+
+        def with_grade(self, *letter_grades):
+            return self.filter(letter_grade__in=letter_grades)
+
+        def failed(self):
+            return self.with_grade('F')
+
+        def of_batch(self, registration_year):
+            return self.filter(report_card__student_profile__registration_year=registration_year)
+
+        def of_course(self, *courses):
+            return self.filter(report_card__student_profile__course__in=courses)
+
+        def grade_distribution(self):
+            return self.values('code', 'letter_grade').annotate(count=models.Count('id')).order_by('code', 'letter_grade')
+
+        def subject_summary(self):
+            return self.values('code').annotate(
+                name=models.Max('name'),
+                students=models.Count('report_card__student_profile', distinct=True),
+                average_grade_points=models.Avg('grade_points'),
+                failures=models.Count('id', filter=models.Q(letter_grade='F')),
+            ).order_by('code')
+
+    objects = models.Manager.from_queryset(QuerySet)()
+
+    class Meta:
+        ordering = ['report_card', 'position']
+        indexes = [
+            models.Index(fields=['code', 'letter_grade']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['report_card', 'position'], name='unique_subject_result_position'),
+        ]
+
+    report_card = models.ForeignKey(SemesterReportCard, on_delete=models.CASCADE, related_name='subject_results')
+    position = models.PositiveSmallIntegerField()
+    name = models.CharField(max_length=255)
+    code = models.CharField(max_length=50)
+    credits = models.FloatField()
+    letter_grade = models.CharField(max_length=2)
+    grade_points = models.FloatField()
+    passing_grade_points = models.FloatField()
+
+    def __str__(self):
+        return f'{self.code} {self.letter_grade}'
+
+
+def load_templates():
+    return {(template.course, template.semester): template for template in SemesterReportCardTemplate.objects.all()}
 
 
 class SemesterReportCardTemplate(models.Model):
+    class SemesterReportCardTemplateManager(models.Manager):
+        cached = ProcessCache(load_templates, 'REPORT_CARD_TEMPLATES_TIMEOUT')
+
+        def invalidate(self):
+            self.cached.invalidate()
+
+        def get_templates(self):
+            return self.cached.get()
+
+        def lookup(self, course, semester):
+            return self.get_templates().get((course, semester))
+
+    objects = SemesterReportCardTemplateManager()
+
     course = models.CharField(
         max_length=6, choices=StudentProfile.course_choices)
     semester = models.PositiveSmallIntegerField()
@@ -338,18 +595,11 @@ class SemesterReportCardTemplate(models.Model):
 
     @cached_property
     def view_users(self):
-        return User.objects.all()
+        return Permitted('view', self)
 
     @cached_property
     def edit_users(self):
-        return User.objects.filter(
-            Q(is_superuser=True) | Q(is_coordinator=True) |
-            Q(
-                Q(student_profile__is_cr=True)
-                & Q(student_profile__course=self.course)
-                # & Q(student_profile__semester=self.semester)
-            )
-        )
+        return Permitted('edit', self)
 
     class Meta:
         unique_together = [['course', 'semester']]
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from settings.models import Setting
+from settings import registry
+from user.models import User, Email, PhoneNumber, Address
+from resume.models import Skill
+from .models import StudentProfile, SemesterReportCardTemplate
+
+
+def update_academic_positions(sender, instance, **kwargs):
+    if instance.key != 'current_academic_half':
+        return
+    value = instance.value if kwargs.get('signal') is post_save else None
+    StudentProfile.objects.update_academic_positions(registry.definitions[instance.key].parse(value))
+
+
+def invalidate_student_data(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    StudentProfile.objects.data_version.invalidate()
+
+
+def invalidate_templates(sender, **kwargs):
+    SemesterReportCardTemplate.objects.invalidate()
+
+
+post_save.connect(update_academic_positions, sender=Setting, dispatch_uid='student_academic_positions_save')
+post_delete.connect(update_academic_positions, sender=Setting, dispatch_uid='student_academic_positions_delete')
+post_save.connect(invalidate_templates, sender=SemesterReportCardTemplate, dispatch_uid='student_templates_save')
+post_delete.connect(invalidate_templates, sender=SemesterReportCardTemplate, dispatch_uid='student_templates_delete')
+
+for model in [User, StudentProfile, Email, PhoneNumber, Address, Skill]:
+    post_save.connect(invalidate_student_data, sender=model, dispatch_uid=f'student_data_save_{model.__name__}')
+    post_delete.connect(invalidate_student_data, sender=model, dispatch_uid=f'student_data_delete_{model.__name__}')
+m2m_changed.connect(invalidate_student_data, sender=Skill.users.through, dispatch_uid='student_data_user_skills')
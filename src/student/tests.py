@@ -1,3 +1,135 @@
+from django.core.management import call_command
 from django.test import TestCase
+from settings import registry
+from testing import create_user
+from .gradesheets import import_grade_sheet
+from .models import StudentProfile, SemesterReportCard, SemesterReportCardTemplate, current_year
+from datetime import datetime
+import io
 
-# Create your tests here.
+
+class SemesterNumberTest(TestCase):
+    def setUp(self):
+        user = create_user('student', 'student')
+        self.profile = StudentProfile.objects.create(user=user, registration_number=20210000001, course='B.Tech',
+                                                     number=1000000001, id_number=1)
+        self.cards = [SemesterReportCard.objects.create(student_profile=self.profile) for _ in range(3)]
+
+    def get_numbers(self):
+        return list(SemesterReportCard.objects.filter(student_profile=self.profile).order_by('pk').values_list(
+            'semester_number', flat=True))
+
+    def test_new_card_numbers_unnumbered_cards_first(self):
+        SemesterReportCard.objects.filter(pk__in=[card.pk for card in self.cards[1:]]).update(semester_number=None)
+        SemesterReportCard.objects.create(student_profile=self.profile)
+        self.assertEqual(self.get_numbers(), [1, 2, 3, 4])
+
+    def test_saving_unnumbered_card_keeps_creation_order(self):
+        SemesterReportCard.objects.filter(pk=self.cards[1].pk).update(semester_number=None)
+        card = SemesterReportCard.objects.get(pk=self.cards[1].pk)
+        card.save()
+        self.assertEqual(card.semester_number, 2)
+        self.assertEqual(self.get_numbers(), [1, 2, 3])
+
+
+class GradeSheetImportTest(TestCase):
+    def setUp(self):
+        for semester in range(1, 4):
+            SemesterReportCardTemplate.objects.create(
+                course='B.Tech', semester=semester, subjects=[f'Subject {semester}1', f'Subject {semester}2'],
+                subject_codes=[f'CS{semester}01', f'CS{semester}02'], subject_credits=[4, 3],
+                subject_passing_grade_points=[5, 5])
+        user = create_user('student', 'student')
+        self.registration_number = (current_year() - 2) * 10 ** 7 + 1
+        self.profile = StudentProfile.objects.create(user=user, registration_number=self.registration_number,
+                                                     course='B.Tech', number=1000000001, id_number=1)
+
+    def get_sheet(self, grades=('A', 'B+')):
+        return io.BytesIO((f'registration_number,CS301,CS301 points,CS302,CS302 points\n'
+                           f'{self.registration_number},{grades[0]},8,{grades[1]},7\n').encode())
+
+    def get_numbers(self):
+        return list(SemesterReportCard.objects.filter(student_profile=self.profile).order_by('pk').values_list(
+            'semester_number', flat=True))
+
+    def add_partially_numbered_cards(self):
+        cards = [SemesterReportCard.objects.create(student_profile=self.profile) for _ in range(2)]
+        SemesterReportCard.objects.filter(pk=cards[1].pk).update(semester_number=None)
+
+    def test_adds_placeholders_for_missing_semesters(self):
+        report = import_grade_sheet(self.get_sheet(), 'grades.csv', 'B.Tech', 3)
+        self.assertEqual((report.created, report.placeholders, report.errors), (1, 2, []))
+        self.assertEqual(self.get_numbers(), [1, 2, 3])
+
+    def test_numbers_unnumbered_cards_instead_of_duplicating_them(self):
+        self.add_partially_numbered_cards()
+        report = import_grade_sheet(self.get_sheet(), 'grades.csv', 'B.Tech', 3)
+        self.assertEqual((report.created, report.placeholders, report.errors), (1, 0, []))
+        self.assertEqual(self.get_numbers(), [1, 2, 3])
+        card = SemesterReportCard.objects.get(student_profile=self.profile, semester_number=3)
+        self.assertEqual(card.subject_letter_grades, ['A', 'B+'])
+
+    def test_dry_run_saves_nothing(self):
+        self.add_partially_numbered_cards()
+        report = import_grade_sheet(self.get_sheet(), 'grades.csv', 'B.Tech', 3, dry_run=True)
+        self.assertEqual((report.created, report.placeholders, report.errors), (1, 0, []))
+        self.assertEqual(self.get_numbers(), [1, None])
+
+    def test_rejects_unknown_letter_grades(self):
+        report = import_grade_sheet(self.get_sheet(('A', 'Z')), 'grades.csv', 'B.Tech', 3)
+        self.assertEqual((report.created, report.placeholders), (0, 0))
+        self.assertEqual(len(report.errors), 1)
+        self.assertIn("'Z'", report.errors[0].message)
+        self.assertEqual(self.get_numbers(), [])
+
+
+class RolloverSemesterTest(TestCase):
+    def setUp(self):
+        registry.update('current_academic_half', 'odd')
+        # The rolled back setting would otherwise stay in this process' registry cache
+        self.addCleanup(registry.invalidate)
+        self.this_year = datetime.now().year
+        self.profiles = []
+        for index, registration_year in enumerate([self.this_year - 1, self.this_year - 2, self.this_year - 6]):
+            user = create_user(f'student{index}', 'student')
+            self.profiles.append(StudentProfile.objects.create(
+                user=user, registration_number=registration_year * 10 ** 7 + index, course='B.Tech',
+                number=1000000000 + index, id_number=index + 1))
+
+    def rollover(self, *args):
+        out = io.StringIO()
+        call_command('rollover_semester', *args, stdout=out)
+        return out.getvalue()
+
+    def get_positions(self):
+        return list(StudentProfile.objects.order_by('pk').values_list('year', 'semester', 'roll'))
+
+    def test_stored_positions_follow_the_academic_half(self):
+        year = self.this_year % 100
+        self.assertEqual(self.get_positions(), [
+            (1, 1, f'1{year}{(self.this_year - 1) % 100}'),
+            (2, 3, f'3{year}{(self.this_year - 2) % 100}'),
+            (4, 7, f'7{year}{(self.this_year - 6) % 100}'),
+        ])
+
+        self.assertIn('Successfully updated 3 student profiles for the even academic half',
+                      self.rollover('--academic-half', 'even'))
+        self.assertEqual(registry.get('current_academic_half'), 'even')
+        self.assertEqual(self.get_positions(), [
+            (1, 2, f'2{year}{(self.this_year - 1) % 100}'),
+            (2, 4, f'4{year}{(self.this_year - 2) % 100}'),
+            (4, 8, f'8{year}{(self.this_year - 6) % 100}'),
+        ])
+
+    def test_reports_only_the_rows_it_changed(self):
+        self.assertIn('Successfully updated 0 student profiles for the odd academic half', self.rollover())
+        StudentProfile.objects.filter(pk=self.profiles[0].pk).update(semester=5, roll='SSYYRR')
+        self.assertIn('Successfully updated 1 student profiles', self.rollover())
+        self.assertEqual(self.get_positions()[0][1], 1)
+
+    def test_positions_match_a_full_save(self):
+        self.rollover('--academic-half', 'even')
+        stored = self.get_positions()
+        for profile in StudentProfile.objects.all():
+            profile.save()
+        self.assertEqual(self.get_positions(), stored)
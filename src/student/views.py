@@ -7,8 +7,10 @@ from views import ChangeObject, ChangeUserKeyObject
 from django.views.generic.base import TemplateView
 from user.models import Email
 from user.views import UserPerformAction
+from cell import stats
 from .models import *
 from .forms import *
+from .gradesheets import GradeSheetError, import_grade_sheet
 
 # Create your views here.
 
@@ -85,8 +87,7 @@ class AcademicInfo(TemplateView):
         context = super().get_context_data(**kwargs)
         context['user'] = profile.user
         context['profile'] = profile
-        context['semester_report_cards'] = [(semester_report_card, SemesterReportCardForm(instance=semester_report_card)) for semester_report_card in SemesterReportCard.objects.filter(
-            student_profile=profile)[0:profile.semester]]
+        context['semester_report_cards'] = [(semester_report_card, SemesterReportCardForm(instance=semester_report_card)) for semester_report_card in profile.semester_report_cards.all()[0:profile.semester]]
 
         context['semester_report_card_empty_form'] = SemesterReportCardForm()
 
@@ -188,6 +189,39 @@ class SemesterReportCardTemplateListView(TemplateView):
         return super().get(request, *args, **kwargs)
 
 
+@method_decorator(login_required, name="dispatch")
+class ImportGradeSheet(TemplateView):
+    template_name = 'grade_sheet_import.html'
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_superuser and not request.user.is_coordinator and not (
+                hasattr(request.user, 'student_profile') and request.user.student_profile.is_cr):
+            raise PermissionDenied()
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.setdefault('form', GradeSheetImportForm())
+        return context
+
+    def post(self, request, *args, **kwargs):
+        form = GradeSheetImportForm(request.POST, request.FILES)
+        context = {'form': form}
+        if form.is_valid():
+            grade_sheet = form.cleaned_data['grade_sheet']
+            try:
+                context['report'] = import_grade_sheet(
+                    grade_sheet, grade_sheet.name, form.cleaned_data['course'], form.cleaned_data['semester'],
+                    year_of_exam=form.cleaned_data['year_of_exam'], user=request.user,
+                    dry_run=form.cleaned_data['dry_run'])
+            except GradeSheetError as error:
+                form.add_error('grade_sheet', str(error))
+            else:
+                if not context['report'].dry_run:
+                    stats.invalidate()
+        return self.render_to_response(self.get_context_data(**context))
+
+
 @method_decorator(login_required, name="dispatch")
 class ChangeSemesterReportCardTemplate(ChangeObject):
     model = SemesterReportCardTemplate
@@ -0,0 +1,14 @@
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def cursor_querystring(context, cursor=None):
+    query = context['request'].GET.copy()
+    query.pop('page', None)
+    query.pop('cursor', None)
+    query['pagination'] = 'cursor'
+    if cursor:
+        query['cursor'] = cursor
+    return '?' + query.urlencode()
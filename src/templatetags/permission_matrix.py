@@ -0,0 +1,10 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def actions_for(permissions, obj):
+    if not permissions:
+        return frozenset()
+    return permissions.actions_for(obj)
@@ -0,0 +1,10 @@
+from user.models import User, Email
+
+
+def create_user(name, role, **kwargs):
+    email = Email.objects.create(email=f'{name}@example.com', is_verified=True)
+    user = User.objects.create(first_name=name, last_name='Test', role=role, primary_email=email, is_approved=True,
+                               **kwargs)
+    email.user = user
+    email.save()
+    return user
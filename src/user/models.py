@@ -1,5 +1,4 @@
 from django.db import models
-from django.db.models import Q
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser, PermissionsMixin
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
@@ -8,6 +7,7 @@ from random import randint
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.functional import cached_property
+from permissions import Permitted
 
 
 # Create your models here.
@@ -104,115 +104,63 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     @cached_property
     def reset_password_users(self):
-        return User.objects.filter(pk=self.pk)
+        return Permitted('reset_password', self)
 
     @cached_property
     def set_password_users(self):
-        if self.is_superuser:
-            return User.objects.filter(pk=self.pk)
-        return User.objects.filter(is_superuser=True)
+        return Permitted('set_password', self)
 
     @cached_property
     def edit_users(self):
-        if self.is_superuser:
-            return User.objects.filter(pk=self.pk)
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.pk)).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def view_users(self):
-        if self.is_superuser or self.is_coordinator or self.role == 'staff' or self.role == 'recruiter' or (self.role == 'student' and self.student_profile.is_cr):
-            return User.objects.all()
-        if self.role == 'student':
-            return User.objects.filter(
-                Q(is_superuser=True) | Q(is_coordinator=True) | Q(pk=self.pk) |
-                Q(
-                    Q(recruitment_posts__applications__in=self.job_applications.all())
-                ) |
-                Q(
-                    Q(student_profile__registration_year=self.student_profile.registration_year) & Q(
-                        student_profile__course=self.student_profile.course) & Q(student_profile__is_cr=True)
-                ) |
-                Q(
-                    Q(student_profile__pass_out_year=self.student_profile.pass_out_year) & Q(
-                        student_profile__course=self.student_profile.course) & Q(student_profile__is_cr=True)
-                )
-            ).distinct()
+        return Permitted('view', self)
 
     @cached_property
     def approve_users(self):
-        if self.is_approved or not self.primary_email.is_verified:
-            return User.objects.none()
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(is_coordinator=True))).distinct()
+        return Permitted('approve', self)
 
     @cached_property
     def delete_users(self):
-        if self.is_approved:
-            return User.objects.none()
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(is_coordinator=True))).distinct()
+        return Permitted('delete', self)
 
     @cached_property
     def make_superuser_users(self):
-        if self.is_superuser or not self.primary_email.is_verified:
-            return User.objects.none()
-        return User.objects.filter(is_superuser=True)
+        return Permitted('make_superuser', self)
 
     @cached_property
     def make_coordinator_users(self):
-        if self.is_coordinator or not self.primary_email.is_verified:
-            return User.objects.none()
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(is_coordinator=True))).distinct()
+        return Permitted('make_coordinator', self)
 
     @cached_property
     def remove_coordinator_users(self):
-        if self.is_superuser or not self.is_coordinator:
-            return User.objects.none()
-        if self.is_coordinator:
-            return User.objects.filter(is_superuser=True)
+        return Permitted('remove_coordinator', self)
 
     @cached_property
     def make_quoter_users(self):
-        if self.is_quoter or not self.is_approved:
-            return User.objects.none()
-        return User.objects.filter(is_superuser=True)
+        return Permitted('make_quoter', self)
 
     @cached_property
     def remove_quoter_users(self):
-        if not self.is_quoter:
-            return User.objects.none()
-        return User.objects.filter(is_superuser=True)
+        return Permitted('remove_quoter', self)
 
     @cached_property
     def make_cr_users(self):
-        if not hasattr(self, 'student_profile') or self.student_profile.is_cr or not self.primary_email.is_verified:
-            return User.objects.none()
-        return User.objects.filter(
-            Q(is_superuser=True) | Q(is_coordinator=True) |
-            Q(
-                Q(student_profile__registration_year=self.student_profile.registration_year) &
-                Q(student_profile__course=self.student_profile.course) &
-                Q(student_profile__is_cr=True)
-            )
-        ).distinct()
+        return Permitted('make_cr', self)
 
     @cached_property
     def remove_cr_users(self):
-        if not hasattr(self, 'student_profile') or not self.student_profile.is_cr:
-            return User.objects.none()
-        return User.objects.filter(
-            Q(is_superuser=True) | Q(is_coordinator=True) | Q(pk=self.pk)
-        )
+        return Permitted('remove_cr', self)
 
     @cached_property
     def make_hod_users(self):
-        if not hasattr(self, 'staff_profile') or self.staff_profile.is_hod or not self.primary_email.is_verified:
-            return User.objects.none()
-        return User.objects.filter(Q(is_superuser=True) | Q(staff_profile__is_hod=True)).distinct()
+        return Permitted('make_hod', self)
 
     @cached_property
     def make_tpc_head_users(self):
-        if not hasattr(self, 'staff_profile') or self.staff_profile.is_tpc_head or not self.primary_email.is_verified:
-            return User.objects.none()
-        return User.objects.filter(Q(is_superuser=True) | Q(staff_profile__is_hod=True) | Q(staff_profile__is_tpc_head=True)).distinct()
+        return Permitted('make_tpc_head', self)
 
     def save(self, *args, **kwargs):
         self.is_doctor = self.check_if_doctor()
@@ -245,19 +193,11 @@ class PhoneNumber(models.Model):
 
     @cached_property
     def set_primary_users(self):
-        if self == self.user.primary_phone_number:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('set_primary', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_phone_number:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def save(self, *args, **kwargs):
         if not PhoneNumber.objects.filter(user=self.user).exists() and self.user != None:
@@ -300,25 +240,15 @@ class Email(models.Model):
 
     @cached_property
     def set_primary_users(self):
-        if self == self.user.primary_email or not self.is_verified:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('set_primary', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_email:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     @cached_property
     def verify_users(self):
-        if self.is_verified:
-            return User.objects.none()
-        return User.objects.filter(Q(is_superuser=True) | Q(pk=self.user.pk)).distinct()
+        return Permitted('verify', self)
 
     def send_verification_email(self, request):
         self.verify_code = str(randint(100000000000, 999999999999))
@@ -378,25 +308,15 @@ class Address(models.Model):
 
     @cached_property
     def edit_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('edit', self)
 
     @cached_property
     def set_primary_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('set_primary', self)
 
     @cached_property
     def delete_users(self):
-        if self == self.user.primary_address:
-            return User.objects.none()
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def save(self, *args, **kwargs):
         if not Address.objects.filter(user=self.user).exists() and self.user != None:
@@ -463,15 +383,11 @@ class Link(models.Model):
 
     @cached_property
     def set_primary_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('set_primary', self)
 
     @cached_property
     def delete_users(self):
-        if self.user.is_superuser:
-            return User.objects.filter(pk=self.user.pk)
-        return User.objects.filter(Q(Q(is_superuser=True) | Q(pk=self.user.pk))).distinct()
+        return Permitted('delete', self)
 
     def __str__(self):
         return self.title + ' : ' + self.url
@@ -1,3 +1,41 @@
+from unittest.mock import patch
 from django.test import TestCase
+from django.urls import reverse
+from student.models import StudentProfile
+from staff.models import StaffProfile
+from resume.models import Skill
+from testing import create_user
+from .views import UserListView
 
-# Create your tests here.
+
+class UserListQueryCountTest(TestCase):
+    queries = 10
+
+    def setUp(self):
+        self.admin = create_user('admin', 'staff', is_superuser=True)
+        StaffProfile.objects.create(user=self.admin)
+        self.skills = [Skill.objects.create(name=name) for name in ['Python', 'Django', 'SQL']]
+        self.students = 0
+
+    def add_students(self, count):
+        for index in range(self.students, self.students + count):
+            user = create_user(f'student{index}', 'student')
+            profile = StudentProfile.objects.create(user=user, registration_number=20210000000 + index, course='B.Tech',
+                                                    number=1000000000 + index, id_number=index + 1)
+            profile.save()
+            user.skills.add(*self.skills[:index % 3 + 1])
+        self.students += count
+
+    def assert_page_queries(self, rows):
+        with self.assertNumQueries(self.queries):
+            response = self.client.get(reverse('user_list') + '?role-filter=student')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['users']), rows)
+
+    @patch.object(UserListView, 'paginate_by', 100)
+    def test_query_count_does_not_grow_with_rows(self):
+        self.client.force_login(self.admin)
+        self.add_students(10)
+        self.assert_page_queries(10)
+        self.add_students(90)
+        self.assert_page_queries(100)
@@ -7,6 +7,7 @@ urlpatterns = [
     path('list/', UserListView.as_view(), name='user_list'),
     path('list/skillautocomplete/', SkillAutocomplete.as_view(), name='user_list_skill_autocomplete'),
     path('list/csv/', UserCSVView.as_view(), name='user_csv'),
+    path('list/actions/', BulkUserAction.as_view(), name='bulk_user_action'),
     path('signin/', SignIn.as_view(), name='sign_in'),
     path('signout/', SignOut.as_view(), name='sign_out'),
     path('resetpassword/<str:email>/<str:code>/', ResetPassword.as_view(), name='reset_password'),
@@ -6,9 +6,12 @@ from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.generic import ListView
 from django.views.generic.base import TemplateView
+from django.db import transaction
 from django.db.models import Q, Prefetch
-from views import AddObject, ChangeObject, AddUserKeyObject, ChangeUserKeyObject, DeleteUserKeyObject
-from student.models import StudentProfile
+from views import AddObject, ChangeObject, AddUserKeyObject, ChangeUserKeyObject, DeleteUserKeyObject, PermissionMatrixMixin, CursorPaginationMixin, CSVStreamMixin
+from permissions import PermissionMatrix
+from cell import stats
+from student.models import StudentProfile, SemesterReportCard
 from staff.models import StaffProfile
 from recruiter.models import RecruiterProfile
 from resume.models import Skill
@@ -16,23 +19,25 @@ from .forms import *
 from .models import User, PhoneNumber, Email, Address, Link
 from django.db.models import Count
 from django.contrib.auth import logout
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from random import randint
-import csv
 
 # Create your views here.
 
 
 @method_decorator(login_required, name="dispatch")
-class UserListView(ListView):
+class UserListView(CursorPaginationMixin, PermissionMatrixMixin, ListView):
     model = User
     template_name = 'users.html'
     context_object_name = 'users'
     ordering = ['id']
     paginate_by = 50
+    permission_actions = ['approve', 'delete', 'make_superuser', 'make_coordinator', 'remove_coordinator',
+                          'make_quoter', 'remove_quoter', 'make_cr', 'remove_cr', 'make_hod', 'make_tpc_head']
+    cursor_fields = ['first_name', 'id']
 
     role_choices = User.role_choices
     course_choices = StudentProfile.course_choices
@@ -55,6 +60,33 @@ class UserListView(ListView):
         ('company', 'Company'),
         ('designation', 'Designation')
     ]
+    user_actions = [
+        ('approve', 'approve_user', 'Approve'),
+        ('delete', 'reject_user', 'Reject'),
+        ('make_superuser', 'make_superuser', 'Make Superuser'),
+        ('make_coordinator', 'make_coordinator', 'Make Coordinator'),
+        ('remove_coordinator', 'remove_coordinator', 'Remove Coordinator'),
+        ('make_quoter', 'make_quoter', 'Make Quoter'),
+        ('remove_quoter', 'remove_quoter', 'Remove Quoter'),
+        ('make_cr', 'make_cr', 'Make CR'),
+        ('remove_cr', 'remove_cr', 'Remove CR'),
+        ('make_hod', 'make_hod', 'Make HOD'),
+        ('make_tpc_head', 'make_tpc_head', 'Make TPC Head'),
+    ]
+    bulk_actions = {
+        'approve': (User, {'is_approved': True}),
+        'delete': (User, None),
+        'make_superuser': (User, {'is_superuser': True, 'is_approved': True}),
+        'make_coordinator': (User, {'is_coordinator': True, 'is_approved': True}),
+        'remove_coordinator': (User, {'is_coordinator': False}),
+        'make_quoter': (User, {'is_quoter': True}),
+        'remove_quoter': (User, {'is_quoter': False}),
+        'make_cr': (StudentProfile, {'is_cr': True}),
+        'remove_cr': (StudentProfile, {'is_cr': False}),
+    }
+    bulk_user_values = {
+        'make_cr': {'is_approved': True},
+    }
 
     def get_queryset(self):
         query = Q()
@@ -79,9 +111,13 @@ class UserListView(ListView):
         return queryset
 
     def get_fetched_queryset(self):
-        student_profiles = StudentProfile.objects.all().only('course', 'cgpa', 'backlog_count', 'registration_year', 'is_current', 'passed_out', 'dropped_out', 'pass_out_year')
-        staff_profiles = StaffProfile.objects.all().only('designation', 'qualification')
-        recruiter_profiles = RecruiterProfile.objects.all().only('company_name', 'designation')
+        semester_report_cards = SemesterReportCard.objects.all().only('student_profile', 'semester_number', 'sgpa', 'backlogs', 'is_complete')
+        student_profiles = StudentProfile.objects.prefetch_related(
+            Prefetch('semester_report_cards', queryset=semester_report_cards)
+        ).only('user', 'course', 'cgpa', 'backlog_count', 'registration_year', 'registration_number', 'number', 'id_card',
+               'is_current', 'passed_out', 'dropped_out', 'pass_out_year', 'is_cr', 'year', 'semester', 'roll')
+        staff_profiles = StaffProfile.objects.all().only('user', 'designation', 'qualification', 'is_hod', 'is_tpc_head')
+        recruiter_profiles = RecruiterProfile.objects.all().only('user', 'company_name', 'designation')
         skills = Skill.objects.all()
 
         return super().get_queryset().select_related('primary_email', 'primary_phone_number', 'primary_address').prefetch_related(
@@ -176,12 +212,11 @@ class UserListView(ListView):
         if enrollment_status:
             students = StudentProfile.objects.all()
             if enrollment_status == 'current':
-                students = students.filter(is_current=True)
+                students = students.current()
             elif enrollment_status == 'passed_out':
-                students = self.apply_pass_out_year_filters(
-                    students.filter(passed_out=True))
+                students = self.apply_pass_out_year_filters(students.alumni())
             elif enrollment_status == 'dropped_out':
-                students = students.filter(dropped_out=True)
+                students = students.dropouts()
             query &= Q(student_profile__in=students)
         return query
 
@@ -293,6 +328,11 @@ class UserListView(ListView):
         if is_approved_filter == 'False' and (self.request.user.is_superuser or self.request.user.is_coordinator):
             context['is_approved_filter'] = False
 
+        context['bulk_actions'] = []
+        if self.request.user.is_superuser or self.request.user.is_coordinator:
+            context['bulk_actions'] = [(action, name) for action, url_name, name in self.user_actions
+                                       if action in self.bulk_actions]
+
         if context['role_filter'] == 'student':
             self.add_student_context(context)
         elif context['role_filter'] == 'staff':
@@ -369,64 +409,127 @@ class UserListView(ListView):
 
 
 @method_decorator(login_required, name="dispatch")
-class UserCSVView(UserListView):
+class BulkUserAction(UserListView):
+    http_method_names = ['post']
+
+    def get_actions(self, user, actions):
+        return [{'name': name, 'url': reverse(url_name, args=[user.pk])}
+                for action, url_name, name in self.user_actions if action in actions]
+
+    def post(self, request):
+        action = request.POST.get('action')
+        if action not in self.bulk_actions:
+            raise BadRequest()
+        model, values = self.bulk_actions[action]
+
+        if request.POST.get('all') == 'true':
+            requested = None
+            users = list(self.get_queryset().order_by())
+        else:
+            requested = [int(user) for user in request.POST.getlist('users') if user.isdigit()]
+            users = list(self.get_fetched_queryset().filter(pk__in=requested))
+
+        permissions = PermissionMatrix(request.user, users, [action])
+        allowed = [user for user in users if action in permissions.actions_for(user)]
+        allowed_ids = [user.pk for user in allowed]
+
+        if allowed_ids:
+            if values is None:
+                User.objects.filter(pk__in=allowed_ids).delete()
+            elif model is User:
+                User.objects.filter(pk__in=allowed_ids).update(**values)
+            else:
+                with transaction.atomic():
+                    model.objects.filter(user__in=allowed_ids).update(**values)
+                    if action in self.bulk_user_values:
+                        User.objects.filter(pk__in=allowed_ids).update(**self.bulk_user_values[action])
+            StudentProfile.objects.data_version.invalidate()
+            stats.invalidate()
+
+        if values is not None:
+            for user in allowed:
+                target = user if model is User else user.student_profile
+                for field, value in values.items():
+                    setattr(target, field, value)
+                for field, value in self.bulk_user_values.get(action, {}).items():
+                    setattr(user, field, value)
+        permissions = PermissionMatrix(request.user, allowed if values is not None else [], self.permission_actions)
+
+        users = {user.pk: user for user in users}
+        allowed_ids = set(allowed_ids)
+        results = []
+        for pk in (users if requested is None else requested):
+            if pk not in users:
+                results.append({'id': pk, 'result': 'not_found'})
+            elif pk not in allowed_ids:
+                results.append({'id': pk, 'result': 'forbidden'})
+            elif values is None:
+                results.append({'id': pk, 'result': 'deleted', 'actions': []})
+            else:
+                results.append({'id': pk, 'result': 'updated',
+                                'actions': self.get_actions(users[pk], permissions.actions_for(pk))})
+
+        return JsonResponse({'action': action, 'updated': len(allowed_ids), 'results': results})
+
+
+@method_decorator(login_required, name="dispatch")
+class UserCSVView(CSVStreamMixin, UserListView):
     content_type = 'text/csv'
+    csv_filename = 'students.csv'
+
+    @classmethod
+    def has_export_permission(cls, user):
+        return user.is_superuser or user.is_coordinator or user.role == 'staff'
 
     def get(self, request):
-        if not request.user.is_superuser and not request.user.is_coordinator and request.user.role != 'staff' :
+        if not self.has_export_permission(request.user):
             raise PermissionDenied()
 
         if self.request.GET.get('role-filter') != 'student':
             return redirect(reverse('user_csv') + '?role-filter=student' + ''.join([f'&{key}={value}' for key, value in self.request.GET.items() if key != 'role-filter']))
 
-        queryset = self.get_queryset()
+        return self.stream_csv(self.get_queryset())
+
+    def get_export_params(self):
+        params = super().get_export_params()
+        params['role-filter'] = ['student']
+        if not self.request.user.is_superuser and not self.request.user.is_coordinator:
+            params.pop('is-approved-filter', None)
+        return params
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="students.csv"'
+    def get_export_stamp(self):
+        return StudentProfile.objects.data_version.get()
+
+    def get_fetched_queryset(self):
+        return User.objects.select_related('primary_email', 'primary_phone_number', 'primary_address').prefetch_related(
+            Prefetch('student_profile', queryset=StudentProfile.objects.all()),
+            Prefetch('skills', queryset=Skill.objects.all())
+        )
 
-        writer = csv.writer(response)
+    def get_csv_header(self):
+        return ['Name', 'Email', 'Phone number', 'Address', 'Registration Year', 'Registration Number', 'Roll Number',
+                'Course', 'Year', 'CGPA', 'Backlogs', 'Pass Out Year', 'Skills', 'Resume URL']
 
+    def get_csv_row(self, user):
         row = []
-        row.append('Name')
-        row.append('Email')
-        row.append('Phone number')
-        row.append('Address')
-        row.append('Registration Year')
-        row.append('Registration Number')
-        row.append('Roll Number')
-        row.append('Course')
-        row.append('Year')
-        row.append('CGPA')
-        row.append('Backlogs')
-        row.append('Pass Out Year')
-        row.append('Skills')
-        row.append('Resume URL')
-
-        writer.writerow(row)
-
-        for user in queryset:
-            row = []
-            row.append(user.full_name)
-            row.append(user.primary_email.email if user.primary_email else '')
-            row.append(user.primary_phone_number.__str__()
-                       if user.primary_phone_number else '')
-            row.append(f'{user.primary_address.address}, {user.primary_address.city}, {user.primary_address.state}, {user.primary_address.country}, {user.primary_address.pincode}' if user.primary_address else '')
-            row.append(user.student_profile.registration_year)
-            row.append(user.student_profile.registration_number)
-            row.append(
-                f'{user.student_profile.roll}-{user.student_profile.number}')
-            row.append(user.student_profile.course)
-            row.append(user.student_profile.year)
-            row.append(user.student_profile.cgpa)
-            row.append(user.student_profile.backlog_count)
-            row.append(user.student_profile.pass_out_year)
-            row.append(', '.join([skill.name for skill in user.skills.all()]))
-            row.append(request.build_absolute_uri(
-                reverse('resume', args=[user.id])))
-
-            writer.writerow(row)
-
-        return response
+        row.append(user.full_name)
+        row.append(user.primary_email.email if user.primary_email else '')
+        row.append(user.primary_phone_number.__str__()
+                   if user.primary_phone_number else '')
+        row.append(f'{user.primary_address.address}, {user.primary_address.city}, {user.primary_address.state}, {user.primary_address.country}, {user.primary_address.pincode}' if user.primary_address else '')
+        row.append(user.student_profile.registration_year)
+        row.append(user.student_profile.registration_number)
+        row.append(
+            f'{user.student_profile.roll}-{user.student_profile.number}')
+        row.append(user.student_profile.course)
+        row.append(user.student_profile.year)
+        row.append(user.student_profile.cgpa)
+        row.append(user.student_profile.backlog_count)
+        row.append(user.student_profile.pass_out_year)
+        row.append(', '.join([skill.name for skill in user.skills.all()]))
+        row.append(self.build_absolute_uri(
+            reverse('resume', args=[user.id])))
+        return row
 
 
 class SignIn(TemplateView):
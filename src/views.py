@@ -3,7 +3,12 @@ from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.core.exceptions import PermissionDenied, ObjectDoesNotExist, BadRequest, ValidationError
 from django.views import View
+from django.http import StreamingHttpResponse
 from user.models import User
+from permissions import PermissionMatrix
+from pagination import CursorPage, get_ordering
+from urllib.parse import urljoin
+import csv
 
 
 class ObjectView(View):
@@ -23,6 +28,78 @@ class ObjectView(View):
         return reverse(self.redirect_url_name, args=self.get_redirect_url_args(request, *args, **kwargs)) + self.get_redirect_url_params(request, *args, **kwargs)
 
 
+class PermissionMatrixMixin:
+    permission_actions = []
+
+    def get_permission_matrix(self, objects):
+        return PermissionMatrix(self.request.user, objects, self.permission_actions)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['permissions'] = self.get_permission_matrix(context['object_list'])
+        return context
+
+
+class CursorPaginationMixin:
+    cursor_fields = []
+    count_timeout = 60
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.request.GET.get('pagination') != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        ordering = get_ordering(queryset, self.cursor_fields)
+        if ordering is None:
+            return super().paginate_queryset(queryset, page_size)
+        page = CursorPage(queryset, ordering, page_size, self.request.GET.get('cursor'), self.count_timeout)
+        return (None, page, page.object_list, page.has_next or page.has_previous)
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class CSVStreamMixin:
+    csv_filename = 'export.csv'
+    csv_chunk_size = 500
+    export_ignored_params = ['page', 'cursor', 'pagination']
+    base_url = None
+
+    @classmethod
+    def has_export_permission(cls, user, **kwargs):
+        return False
+
+    def get_export_params(self):
+        return {key: sorted(self.request.GET.getlist(key)) for key in sorted(self.request.GET)
+                if key not in self.export_ignored_params}
+
+    def get_export_stamp(self):
+        # Changes whenever the exported data does, a finished export is reused while it stays the same
+        return None
+
+    def build_absolute_uri(self, location):
+        if self.base_url:
+            return urljoin(self.base_url, location)
+        return self.request.build_absolute_uri(location)
+
+    def get_csv_header(self):
+        return []
+
+    def get_csv_row(self, obj):
+        return []
+
+    def get_csv_rows(self, queryset):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.get_csv_header())
+        for obj in queryset.iterator(chunk_size=self.csv_chunk_size):
+            yield writer.writerow(self.get_csv_row(obj))
+
+    def stream_csv(self, queryset):
+        response = StreamingHttpResponse(self.get_csv_rows(queryset), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{self.csv_filename}"'
+        return response
+
+
 class AddObject(ObjectView):
     form = None
     template_name = None